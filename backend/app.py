@@ -1,15 +1,28 @@
 import os
+import time
+import queue
+import io
+import json
 import base64
-from flask import Flask, request, jsonify, send_file
+import zipfile
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, g
 from flask_cors import CORS
-from utils.hyperlink import evaluateLink
-from utils.poster_layout import PosterComponentExtractor
-from utils.image_resolution import evaluate_image_accessibility
-from utils.author_extraction import extract_authors
-from utils.caption_extractor import get_image_captions
-from utils.font_size import check_text_font_sizes
+from utils.evaluation import run_evaluation, EVALUATION_STAGES
+from utils.model_registry import model_registry
+from utils.workspace import Workspace, cleanup_expired_workspaces
+from utils.config import (WORKSPACES_DIR, BATCH_MAX_POSTERS, BATCH_MAX_POSTER_BYTES, BATCH_MAX_TOTAL_BYTES,
+                          BATCH_CONCURRENCY, PROFILING_ENABLED, PROFILES_DIR)
+from utils.poster_layout import layout_batch_predictor
+from utils.jobs import JobManager, JobQueueFull
+from utils.result_cache import ResultCache, poster_digest
+from utils.metrics import llm_metrics, registry as metrics_registry, http_request_seconds, http_requests_in_flight
+from utils.hyperlink import link_cache
+from utils.warmup import Warmup
+import utils.llm_cache as llm_cache
 from werkzeug.middleware.proxy_fix import ProxyFix
-import gc
 
 app = Flask(__name__)
 # Add ProxyFix middleware to handle forwarded headers
@@ -18,6 +31,15 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 # Update CORS configuration to explicitly allow your frontend origin
 CORS(app, resources={r"/*": {"origins": ["http://localhost:5173", "https://poster-a11y.vercel.app", "https://postera11y.vercel.app"]}})
 
+# Background evaluations submitted through /jobs
+job_manager = JobManager()
+
+# Reports of recently uploaded posters, keyed by content hash
+result_cache = ResultCache()
+
+# Model loading and dummy inference run at startup, reported by /ready
+warmup = Warmup()
+
 # Add this before your routes
 @app.before_request
 def handle_multipart():
@@ -25,61 +47,99 @@ def handle_multipart():
         # No modification needed, but this intercepts the request before Railway middleware
         pass
 
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    http_requests_in_flight.inc()
+
+def request_endpoint():
+    # The route pattern rather than the path, so job ids and image paths don't each get a series
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+def observe_request(start, endpoint, method, status):
+    http_requests_in_flight.dec()
+    http_request_seconds.observe(time.perf_counter() - start, endpoint, method, str(status))
+
+@app.after_request
+def record_response_status(response):
+    g.response_status = response.status_code
+    if response.is_streamed and "request_start" in g:
+        # Teardown runs before a streamed body is sent, so streamed responses (the NDJSON and SSE
+        # evaluations, file downloads) are measured when the server closes them instead
+        g.metrics_on_close = True
+        response.call_on_close(partial(observe_request, g.request_start, request_endpoint(), request.method,
+                                       response.status_code))
+    return response
+
+@app.teardown_request
+def record_request_metrics(exc):
+    if "request_start" not in g or g.get("metrics_on_close"):
+        return
+    observe_request(g.request_start, request_endpoint(), request.method, g.get("response_status", 500))
+
 # Create required directories
 def ensure_directories_exist():
     """Create all the required directories if they don't exist"""
     directories = [
-        "utils/Input",
-        "utils/Memory/Raw Components",
-        "utils/Output",
-        "utils/Output/Logos",
-        "utils/Output/Color_Contrast",
-        "utils/Buffer",
-        "utils/Buffer/components",
+        WORKSPACES_DIR,
         "utils/Models"
     ]
     
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
 
-# Clear directories for new processing
-def clear_directories():
-    """Clear contents of temporary directories"""
-    directories = [
-        "utils/Input",
-        "utils/Memory/Raw Components",
-        "utils/Output/Logos",
-        "utils/Buffer/components",
-        "utils/Output/Color_Contrast",
-        "utils/Output"
-        # "utils/Models" is intentionally NOT included!
-    ]
-    
-    for directory in directories:
-        if os.path.exists(directory):
-            for filename in os.listdir(directory):
-                file_path = os.path.join(directory, filename)
-                try:
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
-                except Exception as e:
-                    print(f"Error removing {file_path}: {e}")
+def new_workspace():
+    """Create the private workspace of a new evaluation and drop the expired ones"""
+    cleanup_expired_workspaces(keep=job_manager.active_job_ids() | result_cache.workspace_ids())
+    return Workspace()
+
+def save_poster(workspace, image_data, filename):
+    """Write the uploaded poster into the workspace and return its path"""
+    file_path = workspace.input_path(filename)
+    with open(file_path, 'wb') as f:
+        f.write(image_data)
+    return file_path
+
+def read_uploaded_poster():
+    """Bytes and filename of the poster in the request.
+
+    Accepts a multipart upload (a 'poster' file, any file field named like it, or
+    the '0' field of a GraphQL multipart request) or JSON with a base64 'image'.
+    Raises ValueError describing what is missing.
+    """
+    if request.files:
+        poster = request.files.get("poster") or request.files.get("0")
+        if poster is None:
+            poster = next((f for key, f in request.files.items() if 'poster' in key), None)
+        if poster is None:
+            raise ValueError("No poster file provided")
+        if poster.filename == '':
+            raise ValueError("No selected file")
+        return poster.read(), poster.filename
 
-def evaluatePoster(file_path):
-    extractor = PosterComponentExtractor(file_path)
-    extractor.extractComponents()
-    return extractor.get_report()
+    data = request.get_json(silent=True)
+    if not data or 'image' not in data:
+        raise ValueError("No image data provided")
+
+    base64_data = data['image']
+    # Remove the data URL header if present
+    if 'base64,' in base64_data:
+        base64_data = base64_data.split('base64,')[1]
+    return base64.b64decode(base64_data), "uploaded_poster.png"
 
 @app.route('/get-image/<path:image_path>')
 def get_image(image_path):
-    """Generic route to serve any image from utils directory"""
+    """Serve an evaluation artifact from the workspaces under utils"""
     try:
-        # Sanitize the path to prevent directory traversal
-        safe_path = os.path.normpath(image_path).lstrip('/')
-        file_path = os.path.join("utils", safe_path)
-        
+        # Only files inside the evaluation workspaces are served, never the rest of utils
+        # (models, caches) and nothing reached through ../ or symlinks
+        file_path = os.path.realpath(os.path.join("utils", image_path))
+        workspaces = os.path.realpath(WORKSPACES_DIR)
+        if os.path.commonpath([file_path, workspaces]) != workspaces:
+            return jsonify({"error": "Image not found"}), 404
+
         # Check if file exists
-        if not os.path.exists(file_path):
+        if not os.path.isfile(file_path):
             # Return a placeholder image instead
             return jsonify({"error": "Image not found"}), 404
             
@@ -90,186 +150,345 @@ def get_image(image_path):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/evaluate", methods=["POST"])
-def evaluate():
+@app.route('/profiles/<job_id>.prof')
+def get_profile(job_id):
+    """Download the cProfile stats of a profiled evaluation"""
+    if not PROFILING_ENABLED:
+        return jsonify({"error": "Profiling is disabled on this server (set PROFILING_ENABLED)"}), 403
+    return send_from_directory(os.path.abspath(PROFILES_DIR), f"{job_id}.prof",
+                               mimetype='application/octet-stream', as_attachment=True)
+
+def cache_bypassed():
+    """True when the request asks for a fresh evaluation (?no_cache=1 or Cache-Control: no-cache)"""
+    if request.args.get("no_cache", "").lower() in ("1", "true", "yes"):
+        return True
+    return "no-cache" in request.headers.get("Cache-Control", "").lower()
+
+def profile_requested():
+    """True for ?profile=1, which is only honoured when PROFILING_ENABLED is set"""
+    return request.args.get("profile", "").lower() in ("1", "true", "yes")
+
+def evaluate_upload(image_data, filename, use_cache=True, on_sections=None, profile=False, **options):
+    """Evaluate the uploaded poster bytes, serving repeat uploads from the result cache.
+
+    Returns the report and whether it came from the cache. use_cache=False skips
+    both the report cache and the LLM response cache. Profiled evaluations always
+    run and are not cached. on_sections and options are passed on to run_evaluation.
+    """
+    digest = poster_digest(image_data)
+    cached = result_cache.get(digest) if use_cache and not profile else None
+    if cached is not None:
+        return cached, True
+
+    # Every evaluation gets its own workspace
+    workspace = new_workspace()
+    file_path = save_poster(workspace, image_data, filename)
+
+    result = run_evaluation(file_path, workspace, use_cache, on_sections=on_sections, profile=profile, **options)
+    if not profile:
+        # A forced re-evaluation replaces the report cached before
+        result_cache.put(digest, result, workspace, replace=not use_cache)
+    return result, False
+
+def report_response(result, cached):
+    response = jsonify(result)
+    response.headers['X-Cache'] = 'HIT' if cached else 'MISS'
+    return response, 200
+
+def evaluation_response():
+    """Evaluate the poster of the current request, whichever upload format it uses"""
+    if profile_requested() and not PROFILING_ENABLED:
+        return jsonify({"error": "Profiling is disabled on this server (set PROFILING_ENABLED)"}), 403
+
     try:
-        # Ensure directories exist
-        ensure_directories_exist()
-        
-        # Clear directories before processing
-        clear_directories()
-        
-        # Special handling for Railway
-        if request.content_type and 'multipart/form-data' in request.content_type:
-            poster_file = None
-            for key in request.files:
-                if key == 'poster' or 'poster' in key:
-                    poster_file = request.files[key]
-                    break
-                
-            if not poster_file:
-                return jsonify({"error": "No poster file found in request"}), 400
-                
-            if poster_file.filename == '':
-                return jsonify({"error": "No selected file"}), 400
-                
-            # Save the file
-            input_dir = os.path.join("utils", "Input")
-            file_path = os.path.join(input_dir, poster_file.filename)
-            poster_file.save(file_path)
-        else:
-            # Original handling
-            if "poster" not in request.files:
-                return jsonify({"error": "No poster file provided"}), 400
-                
-            poster = request.files["poster"]
-            if poster.filename == '':
-                return jsonify({"error": "No selected file"}), 400
-                
-            # Save the file
-            input_dir = os.path.join("utils", "Input")
-            file_path = os.path.join(input_dir, poster.filename)
-            poster.save(file_path)
-        
-        # Process the poster
-        result = evaluatePoster(file_path)
-        
-        # Add additional analyses
-        hyperlinks = evaluateLink(file_path)
-        if hyperlinks:
-            result["hyperlinks"] = hyperlinks
-            
-        authors = extract_authors(file_path)
-        if authors:
-            result["authors"] = authors
-            
-        resolution = evaluate_image_accessibility(file_path)
-        result["image_resolution"] = resolution
-
-        captions = get_image_captions(file_path)
-        result["captions"] = captions
-
-        font_sizes = check_text_font_sizes(file_path)
-        result["font_sizes"] = font_sizes
-        
-        gc.collect()  # Force garbage collection after processing
-        
-        # Return the complete result
-        return jsonify(result), 200
+        image_data, filename = read_uploaded_poster()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        result, cached = evaluate_upload(image_data, filename, not cache_bypassed(), profile=profile_requested())
+        return report_response(result, cached)
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route("/evaluate", methods=["POST"])
+def evaluate():
+    return evaluation_response()
+
 @app.route("/evaluate-base64", methods=["POST"])
 def evaluate_base64():
-    try:
-        # Ensure directories exist
-        ensure_directories_exist()
-        
-        # Clear directories before processing
-        clear_directories()
-        
-        # Get base64 data from request
-        data = request.json
-        if not data or 'image' not in data:
-            return jsonify({"error": "No image data provided"}), 400
-            
-        # Decode base64 image
-        base64_data = data['image']
-        # Remove header if present
-        if 'base64,' in base64_data:
-            base64_data = base64_data.split('base64,')[1]
-            
-        image_data = base64.b64decode(base64_data)
-        
-        # Save to file
-        input_dir = os.path.join("utils", "Input")
-        file_path = os.path.join(input_dir, "uploaded_poster.png")
-        with open(file_path, 'wb') as f:
-            f.write(image_data)
-        
-        # Process the poster
-        result = evaluatePoster(file_path)
-        
-        # Add additional analyses
-        hyperlinks = evaluateLink(file_path)
-        if hyperlinks:
-            result["hyperlinks"] = hyperlinks
-            
-        authors = extract_authors(file_path)
-        if authors:
-            result["authors"] = authors
-            
-        resolution = evaluate_image_accessibility(file_path)
-        result["image_resolution"] = resolution
-
-        captions = get_image_captions(file_path)
-        result["captions"] = captions
-
-        font_sizes = check_text_font_sizes(file_path)
-        result["font_sizes"] = font_sizes
-        
-        gc.collect()  # Force garbage collection after processing
-        
-        return jsonify(result), 200
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+    return evaluation_response()
 
 @app.route("/evaluate-graphql", methods=["POST"])
 def evaluate_graphql():
+    if 'operations' not in request.form or 'map' not in request.form:
+        return jsonify({"error": "Missing GraphQL multipart fields"}), 400
+    return evaluation_response()
+
+def stream_events(events, sse):
+    """Response writing each event of the queue as an NDJSON line or SSE message until None"""
+    def generate():
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            data = json.dumps(event, default=str)
+            yield f"event: {event['event']}\ndata: {data}\n\n" if sse else data + "\n"
+
+    response = Response(generate(), mimetype="text/event-stream" if sse else "application/x-ndjson")
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route("/evaluate-stream", methods=["POST"])
+def evaluate_stream():
+    """Evaluate a poster and stream each report section as soon as its analyzer finishes.
+
+    Events: one "section" per report key (poster_layout, logo_evaluation,
+    color_contrast, hyperlinks, authors, image_resolution, captions, font_sizes),
+    "stage_failed" for analyzers that failed, then a final "summary" (or "error").
+    NDJSON by default; Server-Sent Events with ?format=sse or Accept: text/event-stream.
+    """
     try:
-        # Check if the post request has the file part
-        if 'operations' not in request.form or 'map' not in request.form:
-            return jsonify({"error": "Missing GraphQL multipart fields"}), 400
-            
-        # For simplicity, just extract the file from the map
-        if '0' not in request.files:
-            return jsonify({"error": "No poster file provided"}), 400
-            
-        poster = request.files['0']
-        if poster.filename == '':
-            return jsonify({"error": "No selected file"}), 400
-            
-        # Save the file
-        input_dir = os.path.join("utils", "Input")
-        file_path = os.path.join(input_dir, poster.filename)
-        poster.save(file_path)
-        
-        # Process the poster as usual
-        result = evaluatePoster(file_path)
-        
-        # Add additional analyses
-        hyperlinks = evaluateLink(file_path)
-        if hyperlinks:
-            result["hyperlinks"] = hyperlinks
-            
-        authors = extract_authors(file_path)
-        if authors:
-            result["authors"] = authors
-            
-        resolution = evaluate_image_accessibility(file_path)
-        result["image_resolution"] = resolution
-
-        captions = get_image_captions(file_path)
-        result["captions"] = captions
-
-        font_sizes = check_text_font_sizes(file_path)
-        result["font_sizes"] = font_sizes
-        
-        gc.collect()  # Force garbage collection after processing
-        
-        return jsonify(result), 200
+        image_data, filename = read_uploaded_poster()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    sse = request.args.get("format") == "sse" or "text/event-stream" in request.headers.get("Accept", "")
+    use_cache = not cache_bypassed()
+    events = queue.Queue()
+
+    def send_sections(sections):
+        for name, data in sections.items():
+            events.put({"event": "section", "section": name, "data": data})
+
+    def on_sections(stage, status, sections):
+        # Failed analyzers still send their default sections, after a stage_failed event
+        if status == "failed":
+            events.put({"event": "stage_failed", "stage": stage})
+        send_sections(sections)
+
+    def evaluate_in_background():
+        start = time.perf_counter()
+        try:
+            result, cached = evaluate_upload(image_data, filename, use_cache, on_sections=on_sections)
+            sections = {name: data for name, data in result.items() if name not in ("job_id", "stages")}
+            if cached:
+                send_sections(sections)
+            events.put({
+                "event": "summary",
+                "job_id": result.get("job_id"),
+                "cached": cached,
+                "sections": list(sections),
+                "stages": result.get("stages", {}),
+                "seconds": round(time.perf_counter() - start, 3)
+            })
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            events.put({"event": "error", "error": str(e)})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=evaluate_in_background, daemon=True).start()
+    return stream_events(events, sse)
+
+POSTER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tif', '.tiff')
+
+def read_batch_posters():
+    """(filename, bytes) of every poster in a batch request.
+
+    Accepts multipart files (any number, zips are unpacked) or a raw zip body.
+    Raises ValueError if there are none, too many or they are too large. Sizes
+    are checked before reading, from the declared size of every zip member, so
+    a small archive can't unpack into gigabytes.
+    """
+    total = 0
+
+    def check_size(name, size, limit):
+        nonlocal total
+        total += size
+        if size > limit:
+            raise ValueError(f"{name} is too large ({size} bytes), the limit is {limit}")
+        if total > BATCH_MAX_TOTAL_BYTES:
+            raise ValueError(f"The posters are too large together, the limit is {BATCH_MAX_TOTAL_BYTES} bytes")
+
+    uploads = []
+    for _, f in request.files.items(multi=True):
+        if f.filename:
+            # Read one byte past the limit, enough to tell that the file is over it
+            data = f.read(BATCH_MAX_TOTAL_BYTES + 1)
+            limit = BATCH_MAX_TOTAL_BYTES if f.filename.lower().endswith(".zip") else BATCH_MAX_POSTER_BYTES
+            check_size(f.filename, len(data), limit)
+            uploads.append((f.filename, data))
+    if not uploads and request.content_type in ("application/zip", "application/x-zip-compressed"):
+        if request.content_length is None:
+            raise ValueError("A zip body needs a Content-Length")
+        check_size("posters.zip", request.content_length, BATCH_MAX_TOTAL_BYTES)
+        uploads = [("posters.zip", request.get_data())]
+
+    # The uploads themselves were counted above, from here on only what they hold
+    total = 0
+    posters = []
+    for filename, data in uploads:
+        if not filename.lower().endswith(".zip"):
+            check_size(filename, len(data), BATCH_MAX_POSTER_BYTES)
+            posters.append((filename, data))
+            continue
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for member in archive.infolist():
+                name = os.path.basename(member.filename)
+                if member.is_dir() or name.startswith('.') or '__MACOSX' in member.filename:
+                    continue
+                if name.lower().endswith(POSTER_EXTENSIONS):
+                    check_size(name, member.file_size, BATCH_MAX_POSTER_BYTES)
+                    posters.append((name, archive.read(member)))
+        if len(posters) > BATCH_MAX_POSTERS:
+            break
+
+    if not posters:
+        raise ValueError("No poster files provided")
+    if len(posters) > BATCH_MAX_POSTERS:
+        raise ValueError(f"Too many posters ({len(posters)}), the limit is {BATCH_MAX_POSTERS}")
+    return posters
+
+@app.route("/evaluate-batch", methods=["POST"])
+def evaluate_batch():
+    """Evaluate many posters in one request.
+
+    Posters are evaluated BATCH_CONCURRENCY at a time, so the OCR and Gemini stages of
+    different posters overlap, and their YOLO layout detections are grouped into list
+    predictions. Returns one JSON line per poster in upload order, streamed as they
+    complete, or a zip of JSON reports with ?format=zip.
+    """
+    try:
+        posters = read_batch_posters()
+    except (ValueError, zipfile.BadZipFile) as e:
+        return jsonify({"error": str(e)}), 400
+
+    use_cache = not cache_bypassed()
+    as_zip = request.args.get("format") == "zip"
+    layout_predictor = layout_batch_predictor()
+    executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix="batch")
+    futures = [
+        executor.submit(evaluate_upload, data, filename, use_cache, layout_predictor=layout_predictor)
+        for filename, data in posters
+    ]
+
+    def entries():
+        try:
+            for (filename, _), future in zip(posters, futures):
+                try:
+                    result, cached = future.result()
+                    yield {"filename": filename, "cached": cached, "report": result}
+                except Exception as e:
+                    yield {"filename": filename, "error": str(e)}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if as_zip:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for i, entry in enumerate(entries()):
+                name = os.path.splitext(entry["filename"])[0]
+                archive.writestr(f"{i + 1:03d}_{name}.json", json.dumps(entry, default=str))
+        buffer.seek(0)
+        return send_file(buffer, mimetype="application/zip", as_attachment=True, download_name="reports.zip")
+
+    response = Response((json.dumps(entry, default=str) + "\n" for entry in entries()), mimetype="application/x-ndjson")
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """Queue an evaluation and return its job ID right away"""
+    try:
+        try:
+            image_data, filename = read_uploaded_poster()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        workspace = new_workspace()
+        file_path = save_poster(workspace, image_data, filename)
+
+        try:
+            job = job_manager.submit(workspace.job_id, EVALUATION_STAGES, run_evaluation,
+                                     file_path, workspace, not cache_bypassed())
+        except JobQueueFull as e:
+            workspace.remove()
+            return jsonify({"error": str(e)}), 503
+
+        return jsonify({
+            "job_id": job.job_id,
+            "status": job.status,
+            "status_url": f"jobs/{job.job_id}"
+        }), 202
     except Exception as e:
+        import traceback
+        traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Status, per-stage progress and, once done, the report of a submitted evaluation"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found or expired"}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/cache', methods=['GET'])
+def cache_stats():
+    """Hit/miss counters of the poster result cache"""
+    return jsonify(result_cache.stats()), 200
+
+@app.route('/llm', methods=['GET'])
+def llm_stats():
+    """Gemini request counters, image payload savings and response cache hit rate"""
+    return jsonify({
+        "requests": llm_metrics.stats(),
+        "payloads": llm_metrics.payload_stats(),
+        "cache": llm_cache.llm_cache.stats() if llm_cache.llm_cache else None
+    }), 200
+
+def cache_stats_by_name():
+    caches = {"result": result_cache, "link": link_cache, "llm": llm_cache.llm_cache}
+    return {name: cache.stats() for name, cache in caches.items() if cache is not None}
+
+# Read from the caches, LLM counters and model registry when /metrics is scraped
+metrics_registry.collect("poster_cache_hits_total", "Cache lookups that were answered from the cache", ["cache"],
+                         "counter", lambda: {(name, ): stats["hits"] for name, stats in cache_stats_by_name().items()})
+metrics_registry.collect("poster_cache_misses_total", "Cache lookups that missed", ["cache"],
+                         "counter", lambda: {(name, ): stats["misses"] for name, stats in cache_stats_by_name().items()})
+metrics_registry.collect("poster_cache_entries", "Entries held by each cache", ["cache"],
+                         "gauge", lambda: {(name, ): stats["entries"] for name, stats in cache_stats_by_name().items()})
+metrics_registry.collect("poster_model_load_seconds", "Time taken to load each model", ["model"],
+                         "gauge", lambda: {(name, ): stats.get("load_seconds")
+                                           for name, stats in model_registry.stats().items()})
+metrics_registry.collect("poster_ready", "1 once the models are loaded and warmed up", [],
+                         "gauge", lambda: {(): int(warmup.ready)})
+metrics_registry.collect("poster_warmup_step_seconds", "Duration of each warm-up step", ["step"],
+                         "gauge", lambda: {(step, ): seconds for step, seconds in warmup.steps.items()})
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Latency histograms, counters and gauges in the Prometheus text format"""
+    return Response(metrics_registry.render(), mimetype="text/plain; version=0.0.4")
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint for Render"""
+    """Health check endpoint for Render, unhealthy once the warm-up has failed for good so the instance is replaced"""
+    if warmup.status == "failed":
+        return jsonify({"status": "unhealthy", "warmup": warmup.to_dict()}), 503
     return jsonify({"status": "healthy"}), 200
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 200 once the models are loaded and warmed up, 503 until then or if warm-up failed"""
+    return jsonify(warmup.to_dict()), 200 if warmup.ready else 503
+
 @app.route("/debug-request", methods=["POST", "GET"])
 def debug_request():
     if request.method == "GET":
@@ -294,24 +513,18 @@ def debug_request():
         }
         return jsonify(data)
 
-def ensure_models_downloaded():
-    """Download models from GCS at startup"""
-    from utils.model_loader import get_model_paths
-    
-    model_paths = get_model_paths()
-    missing_models = [name for name, path in model_paths.items() if path is None]
-    
-    if missing_models:
-        print(f"WARNING: Failed to download the following models: {missing_models}")
-        print("The application may not function correctly!")
-    else:
-        print("All models successfully downloaded/located")
+@app.route('/models', methods=['GET'])
+def model_stats():
+    """Load time and memory of each model in the shared registry"""
+    return jsonify(model_registry.stats()), 200
+
+# Load and warm up the models once per process, including when served by gunicorn.
+# It runs in the background so /health answers right away; /ready waits for it.
+ensure_directories_exist()
+warmup.start()
 
-# Make sure this is called at startup
+# Local development server
 if __name__ == "__main__":
-    # Ensure directories exist at startup
-    ensure_directories_exist()
-    ensure_models_downloaded()  # Add this line
     # Use environment variables for port configuration
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", debug=False, port=port)
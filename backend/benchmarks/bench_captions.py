@@ -0,0 +1,87 @@
+"""Caption requests: sequential, concurrent, concurrent with 429s, batched and cached.
+
+Uses the fake LLM client, so it runs offline. Run from the backend directory:
+    python -m benchmarks.bench_captions --figures 12 --latency 0.5
+"""
+import argparse
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from utils.caption_extractor import process_captions
+from utils.components import Component
+from utils.llm_client import TokenBucket
+from utils.metrics import LLMMetrics
+from utils.llm_cache import LLMResponseCache
+import utils.llm_cache as llm_cache
+import utils.llm_client as llm_client
+from benchmarks.fake_llm import FakeLLM
+
+
+def synthetic_components(poster, directory, count):
+    components = []
+    types = ['bar_graphs', 'pie_chart', 'line_graph', 'diagram', 'table']
+    for i in range(count):
+        x, y = (i % 4) * 200, (i // 4) * 200
+        components.append(Component(types[i % len(types)], i, (x, y, x + 180, y + 180),
+                                    poster[y:y + 180, x:x + 180], directory))
+    return components
+
+
+def run(poster_path, components, concurrency, rps, mode="per_component", **fake_args):
+    llm_client.rate_limiter = TokenBucket(rate=rps, burst=concurrency)
+    llm_client.llm_metrics = LLMMetrics()
+    client = FakeLLM(**fake_args)
+    start = time.perf_counter()
+    results = process_captions(poster_path, components, client, max_concurrency=concurrency, mode=mode)
+    return results, time.perf_counter() - start, client, llm_client.llm_metrics.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--figures", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake response time per request")
+    parser.add_argument("--latency-per-image", type=float, default=0.05, help="extra fake time per image sent")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=8, help="rate limit for the benchmark")
+    args = parser.parse_args()
+    fake = dict(latency=args.latency, latency_per_image=args.latency_per_image)
+    llm_cache.llm_cache = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        poster = np.random.default_rng(0).integers(0, 255, (800, 800, 3), dtype=np.uint8)
+        poster_path = os.path.join(directory, "poster.png")
+        cv2.imwrite(poster_path, poster)
+        components = synthetic_components(poster, directory, args.figures)
+
+        runs = {
+            "sequential": run(poster_path, components, 1, args.rps, **fake),
+            f"concurrent ({args.concurrency})": run(poster_path, components, args.concurrency, args.rps, **fake),
+            "concurrent + 429s": run(poster_path, components, args.concurrency, args.rps,
+                                     rate_limit_every=5, **fake),
+            "batch": run(poster_path, components, args.concurrency, args.rps, mode="batch", **fake),
+            "batch, 2 dropped": run(poster_path, components, args.concurrency, args.rps, mode="batch",
+                                    drop={components[0].name, components[-1].name}, **fake),
+        }
+
+        # The same poster evaluated twice with the response cache on
+        llm_cache.llm_cache = LLMResponseCache(os.path.join(directory, "llm.sqlite3"))
+        runs["batch, cold cache"] = run(poster_path, components, args.concurrency, args.rps, mode="batch", **fake)
+        runs["batch, warm cache"] = run(poster_path, components, args.concurrency, args.rps, mode="batch", **fake)
+        cache_stats = llm_cache.llm_cache.stats()
+
+    expected = runs["sequential"][0]
+    print(f"{args.figures} captions, {args.latency}s + {args.latency_per_image}s per image per request")
+    print(f"{'run':<20} {'seconds':>8} {'calls':>6} {'payload MB':>11} {'~tokens':>8}")
+    for name, (results, seconds, client, stats) in runs.items():
+        # Every mode must produce the same report, in the same order
+        assert list(results) == list(expected) and results == expected, name
+        payload = sum(entry["payload_bytes"] for entry in stats.values())
+        tokens = sum(entry["estimated_tokens"] for entry in stats.values())
+        print(f"{name:<20} {seconds:>8.2f} {client.calls:>6} {payload / 1e6:>11.2f} {tokens:>8}")
+    print(f"response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark of the vectorized color contrast core against the original per-pixel Python code.
+
+Both versions get the same k-means centers, so any difference comes from the edge
+voting, luminance and contrast ratio code. Run from the backend directory:
+    python -m benchmarks.bench_color_contrast --repeat 5
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from utils.color_contrast_evaluation import count_edge_votes, calculate_contrast_ratio, get_relative_luminance
+
+# Text block sizes (height, width) seen on 4-8k pixel wide posters
+CROP_SIZES = [(120, 900), (400, 1600), (900, 2400), (1600, 3200)]
+
+
+def legacy_relative_luminance(r, g, b):
+    r, g, b = r/255, g/255, b/255
+    r = r/12.92 if r <= 0.03928 else ((r + 0.055)/1.055) ** 2.4
+    g = g/12.92 if g <= 0.03928 else ((g + 0.055)/1.055) ** 2.4
+    b = b/12.92 if b <= 0.03928 else ((b + 0.055)/1.055) ** 2.4
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def legacy_contrast_ratio(text_color, background_color):
+    l1 = legacy_relative_luminance(*text_color)
+    l2 = legacy_relative_luminance(*background_color)
+    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+
+
+def legacy_edge_votes(edge_pixels, colors):
+    return [sum(1 for pixel in edge_pixels if np.sum((pixel - color) ** 2) <
+                np.sum((pixel - other_color) ** 2)) for color, other_color in
+            [(colors[0], colors[1]), (colors[1], colors[0])]]
+
+
+def synthetic_text_crop(height, width, rng):
+    background = rng.integers(0, 256, 3).tolist()
+    text = rng.integers(0, 256, 3).tolist()
+    crop = np.full((height, width, 3), background, dtype=np.uint8)
+    line_height = max(24, height // 12)
+    for y in range(line_height, height, line_height + 8):
+        cv2.putText(crop, "Poster accessibility text " * 8, (10, y), cv2.FONT_HERSHEY_SIMPLEX,
+                    line_height / 30, text, 2)
+    noise = rng.integers(-6, 7, crop.shape)
+    return np.clip(crop.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def edge_pixels_of(crop):
+    img_rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+    return np.vstack([img_rgb[:10, :].reshape(-1, 3), img_rgb[-10:, :].reshape(-1, 3),
+                      img_rgb[:, :10].reshape(-1, 3), img_rgb[:, -10:].reshape(-1, 3)])
+
+
+def kmeans_colors(crop):
+    pixels = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB).reshape(-1, 3)
+    cv2.setRNGSeed(0)
+    _, _, centers = cv2.kmeans(np.float32(pixels), 2, None,
+                               (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 200, .1),
+                               10, cv2.KMEANS_RANDOM_CENTERS)
+    return np.uint8(centers)
+
+
+def legacy_core(edge_pixels, colors):
+    votes = legacy_edge_votes(edge_pixels, colors)
+    background, text = colors[np.argmax(votes)], colors[1 - np.argmax(votes)]
+    return votes, legacy_contrast_ratio(tuple(map(int, text)), tuple(map(int, background)))
+
+
+def vectorized_core(edge_pixels, colors):
+    votes = count_edge_votes(edge_pixels, colors)
+    background, text = colors[np.argmax(votes)], colors[1 - np.argmax(votes)]
+    return votes, calculate_contrast_ratio(tuple(map(int, text)), tuple(map(int, background)))
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    # The lookup table must reproduce the scalar luminance exactly
+    for value in range(256):
+        assert legacy_relative_luminance(value, 255 - value, value // 2) == \
+            get_relative_luminance(value, 255 - value, value // 2)
+
+    print(f"{'crop':>12} {'edge px':>8} {'legacy ms':>10} {'numpy ms':>9} {'speedup':>8}  identical")
+    for height, width in CROP_SIZES:
+        crop = synthetic_text_crop(height, width, rng)
+        edge_pixels = edge_pixels_of(crop)
+        colors = kmeans_colors(crop)
+
+        legacy_seconds, legacy_result = timed(lambda: legacy_core(edge_pixels, colors), args.repeat)
+        vector_seconds, vector_result = timed(lambda: vectorized_core(edge_pixels, colors), args.repeat)
+        identical = legacy_result == vector_result
+
+        print(f"{height:>5}x{width:<6} {len(edge_pixels):>8} {legacy_seconds * 1000:>10.2f} "
+              f"{vector_seconds * 1000:>9.3f} {legacy_seconds / vector_seconds:>7.0f}x  {identical}")
+        assert identical, f"results differ: {legacy_result} != {vector_result}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Drift and speed of the poster palette contrast mode against per-section k-means.
+
+Renders a synthetic poster with text blocks in random color pairs (or takes a real
+poster and tiles it into sections), evaluates every section both ways and reports
+how often the PASS/FAIL verdicts disagree. Run from the backend directory:
+    python -m benchmarks.bench_contrast_palette --blocks 80
+    python -m benchmarks.bench_contrast_palette --poster utils/Input/poster.png
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from utils.color_contrast_evaluation import PosterPalette, get_dominant_colors, calculate_contrast_ratio
+
+THRESHOLDS = (3.0, 4.5)
+
+
+def synthetic_poster(width, height, blocks, schemes, rng):
+    """Poster with text blocks laid out in a grid, colored from a few color schemes"""
+    poster = np.full((height, width, 3), 245, dtype=np.uint8)
+    color_schemes = [(rng.integers(0, 256, 3).tolist(), rng.integers(0, 256, 3).tolist())
+                     for _ in range(schemes)]
+    columns = max(1, int(np.sqrt(blocks * width / height)))
+    rows = -(-blocks // columns)
+    cell_w, cell_h = width // columns, height // rows
+    sections = []
+    for i in range(blocks):
+        background, text = color_schemes[int(rng.integers(0, schemes))]
+        w, h = int(cell_w * rng.uniform(0.6, 0.95)), int(cell_h * rng.uniform(0.5, 0.9))
+        x, y = (i % columns) * cell_w + 10, (i // columns) * cell_h + 10
+        cv2.rectangle(poster, (x, y), (x + w, y + h), background, -1)
+        line_height = int(rng.integers(24, 60))
+        for line_y in range(y + line_height, y + h - 10, line_height + 10):
+            cv2.putText(poster, "Accessible poster text " * 6, (x + 12, line_y), cv2.FONT_HERSHEY_SIMPLEX,
+                        line_height / 32, text, max(1, line_height // 16))
+        sections.append((x, y, x + w, y + h))
+    noise = rng.integers(-4, 5, poster.shape)
+    poster = np.clip(poster.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    return poster, sections
+
+
+def tiled_sections(image, tile):
+    height, width = image.shape[:2]
+    return [(x, y, min(x + tile, width), min(y + tile // 3, height))
+            for y in range(0, height - tile // 3, tile // 3)
+            for x in range(0, width - tile, tile)]
+
+
+def ratio_of(colors):
+    text_color, background_color = colors
+    return calculate_contrast_ratio(tuple(map(int, text_color)), tuple(map(int, background_color)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--poster", help="real poster to tile into sections instead of a synthetic one")
+    parser.add_argument("--tile", type=int, default=900, help="section width when tiling a real poster")
+    parser.add_argument("--width", type=int, default=7200)
+    parser.add_argument("--height", type=int, default=4800)
+    parser.add_argument("--blocks", type=int, default=60)
+    parser.add_argument("--schemes", type=int, default=6, help="distinct text/background color pairs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.poster:
+        poster = cv2.imread(args.poster)
+        sections = tiled_sections(poster, args.tile)
+    else:
+        poster, sections = synthetic_poster(args.width, args.height, args.blocks, args.schemes, rng)
+
+    cv2.setRNGSeed(args.seed)
+    start = time.perf_counter()
+    kmeans_ratios = [ratio_of(get_dominant_colors(poster[y1:y2, x1:x2])) for x1, y1, x2, y2 in sections]
+    kmeans_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    palette = PosterPalette(poster)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    palette_ratios = []
+    for x1, y1, x2, y2 in sections:
+        colors = palette.section_colors(x1, y1, x2, y2)
+        palette_ratios.append(ratio_of(colors) if colors is not None else None)
+    palette_seconds = time.perf_counter() - start
+
+    pairs = [(k, p) for k, p in zip(kmeans_ratios, palette_ratios) if p is not None]
+    differences = np.abs(np.array([k - p for k, p in pairs]))
+
+    print(f"{poster.shape[1]}x{poster.shape[0]} poster, {len(sections)} sections, "
+          f"{len(palette.colors)} palette colors, {palette.cell_size}px cells")
+    print(f"k-means per section:   {kmeans_seconds * 1000 / len(sections):8.2f} ms/section")
+    print(f"palette build:         {build_seconds * 1000:8.2f} ms (once per poster)")
+    print(f"palette per section:   {palette_seconds * 1000 / len(sections):8.3f} ms/section")
+    print(f"contrast ratio drift:  mean {differences.mean():.3f}, median {np.median(differences):.3f}, "
+          f"max {differences.max():.3f}")
+    for threshold in THRESHOLDS:
+        flipped = sum((k >= threshold) != (p >= threshold) for k, p in pairs)
+        print(f"verdicts flipped at {threshold}: {flipped}/{len(pairs)} ({100 * flipped / len(pairs):.1f}%)")
+    skipped = len(sections) - len(pairs)
+    if skipped:
+        print(f"{skipped} sections smaller than a palette cell fell back to k-means")
+
+
+if __name__ == "__main__":
+    main()
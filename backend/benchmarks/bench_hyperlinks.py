@@ -0,0 +1,54 @@
+"""Sequential link checks against the concurrent, deduplicated and cached check_links.
+
+Uses the local stand-in server, so it runs offline. Run from the backend directory:
+    python -m benchmarks.bench_hyperlinks --slow 10 --delay 1
+"""
+import argparse
+import time
+from utils.hyperlink import check_link, check_links, LinkCache
+from benchmarks.link_standin import StandInServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slow", type=int, default=10, help="number of slow links on the poster")
+    parser.add_argument("--delay", type=float, default=1.0, help="response delay of a slow link")
+    parser.add_argument("--deadline", type=float, default=15.0)
+    args = parser.parse_args()
+
+    with StandInServer() as server:
+        urls = [server.url(f"slow/{args.delay}?n={i}") for i in range(args.slow)]
+        urls += [server.url("ok"), server.url("redirect/3"), server.url("fail"), server.url("missing")]
+        # Posters often repeat a link, e.g. in the header and the references
+        urls += urls[:len(urls) // 2]
+        expected = {url: not url.endswith(("fail", "missing")) for url in urls}
+
+        start = time.perf_counter()
+        sequential = {url: check_link(url) for url in urls}
+        sequential_seconds = time.perf_counter() - start
+
+        cache = LinkCache()
+        start = time.perf_counter()
+        concurrent = check_links(urls, deadline=args.deadline, cache=cache)
+        concurrent_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cached = check_links(urls, deadline=args.deadline, cache=cache)
+        cached_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        short_deadline = check_links([server.url("slow/3"), server.url("ok")], deadline=0.5, cache=None)
+        deadline_seconds = time.perf_counter() - start
+
+    assert sequential == expected and concurrent == expected and cached == expected
+    assert short_deadline == {server.url("slow/3"): False, server.url("ok"): True}
+
+    print(f"{len(urls)} links ({len(set(urls))} unique, {args.slow} slow at {args.delay}s)")
+    print(f"sequential check_link:  {sequential_seconds:6.2f} s")
+    print(f"check_links:            {concurrent_seconds:6.2f} s")
+    print(f"check_links (cached):   {cached_seconds:6.3f} s")
+    print(f"0.5 s deadline on a 3 s link returned after {deadline_seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Bytes and encode time of the poster sent to Gemini: full-size PNG vs the prepared payload.
+
+The old author extraction re-encoded the full poster to PNG on every call, and
+the caption requests uploaded it at full resolution. Run from the backend directory:
+    python -m benchmarks.bench_llm_payload --width 10000 --height 7000
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from utils.llm_payload import prepare_image
+
+
+def synthetic_poster(width, height, seed=0):
+    """Light background with text-like stripes and a few noisy photo areas"""
+    rng = np.random.default_rng(seed)
+    poster = np.full((height, width, 3), 245, dtype=np.uint8)
+    for y in range(0, height, 40):
+        for x in range(0, width, 900):
+            length = int(rng.integers(200, 850))
+            poster[y + 10:y + 24, x + 20:x + 20 + length] = rng.integers(0, 90, 3)
+    for _ in range(6):
+        x, y = int(rng.integers(0, width - 1500)), int(rng.integers(0, height - 1000))
+        poster[y:y + 1000, x:x + 1500] = rng.integers(0, 255, (1000, 1500, 3), dtype=np.uint8)
+    return poster
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=10000)
+    parser.add_argument("--height", type=int, default=7000)
+    parser.add_argument("--max-edge", type=int, default=3072)
+    args = parser.parse_args()
+
+    poster = synthetic_poster(args.width, args.height)
+
+    start = time.perf_counter()
+    ok, png = cv2.imencode(".png", poster)
+    png_seconds = time.perf_counter() - start
+    print(f"{'full-size PNG':<24} {len(png) / 1e6:>8.2f} MB {png_seconds:>7.2f}s")
+
+    for image_format in ("jpeg", "webp"):
+        for quality in (75, 85):
+            start = time.perf_counter()
+            payload = prepare_image(poster, max_edge=args.max_edge, image_format=image_format, quality=quality)
+            seconds = time.perf_counter() - start
+            label = f"{image_format} q{quality} {payload.width}x{payload.height}"
+            print(f"{label:<24} {payload.nbytes / 1e6:>8.2f} MB {seconds:>7.2f}s "
+                  f"({len(png) / payload.nbytes:.0f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Per-stage and end-to-end timings of the poster evaluation on synthetic posters.
+
+Reports wall time, CPU time, memory growth and throughput of every stage as JSON
+and compares them with a saved baseline. Links are routed to the local stand-in
+server and Gemini to the fake client, so it runs offline. Stages whose models or
+binaries are missing (YOLO, spaCy, Tesseract) are reported as skipped, with the
+reason. Run from the backend
+directory:
+    python -m benchmarks.bench_pipeline --posters 3 --repeat 3 --output baseline.json
+    python -m benchmarks.bench_pipeline --posters 3 --repeat 3 --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import cv2
+import numpy as np
+from utils.components import Component
+from utils.ocr import OcrIndex
+from utils.llm_client import TokenBucket
+from utils.config import LLM_REQUESTS_PER_SECOND, LLM_BURST
+from utils.workspace import Workspace
+from utils.analyzers import AnalyzerFailed
+import utils.llm_cache as llm_cache
+import utils.llm_client as llm_client
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.link_standin import StandInServer, route_links_to
+from benchmarks.synthetic_poster import make_poster
+
+TEXT_TYPES = ("title", "authors", "heading", "plain_text", "caption")
+
+
+def rss_bytes():
+    """Resident set size of this process (Linux), or 0 if it can't be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+class PeakRSS:
+    """Samples the resident set size on a background thread and keeps the maximum.
+
+    growth is how far the peak rose above the RSS at the start, i.e. what the
+    stage itself needed on top of what earlier stages left allocated.
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.start = self.peak = rss_bytes()
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+    @property
+    def growth(self):
+        return self.peak - self.start
+
+
+class SyntheticPoster:
+    """A rendered poster saved to disk, with the components and OCR words it is known to contain"""
+
+    def __init__(self, directory, index, args):
+        image, self.layout, self.words = make_poster(args.width, args.height, args.columns, args.density,
+                                                     args.seed + index)
+        self.image = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+        self.directory = directory
+        self.path = os.path.join(directory, f"poster_{index}.png")
+        cv2.imwrite(self.path, self.image)
+
+    def components(self):
+        """Fresh Component objects for the layout, as the extractor would produce them"""
+        counts, components = {}, []
+        for block in self.layout:
+            counts[block["type"]] = counts.get(block["type"], 0) + 1
+            x1, y1, x2, y2 = block["bbox"]
+            components.append(Component(block["type"], counts[block["type"]], block["bbox"],
+                                        self.image[y1:y2, x1:x2], os.path.join(self.directory, "components")))
+        return components
+
+    def ocr(self):
+        """OcrIndex built from the rendered word boxes instead of a Tesseract pass"""
+        data = {key: [] for key in ("text", "conf", "left", "top", "width", "height",
+                                    "block_num", "par_num", "line_num")}
+        for word in self.words:
+            x1, y1, x2, y2 = word["bbox"]
+            for key, value in zip(data, (word["text"], 96, x1, y1, x2 - x1, y2 - y1, 1, 1, word["line"])):
+                data[key].append(value)
+        return OcrIndex(data)
+
+
+# Each stage prepares its inputs untimed and returns the callable that is timed
+
+def stage_extract_components(poster, args):
+    from utils.poster_layout import PosterComponentExtractor
+    workspace = Workspace(root=os.path.join(poster.directory, "workspaces"))
+    extractor = PosterComponentExtractor(poster.path, workspace=workspace, image=poster.image)
+    return extractor.extractComponents
+
+
+def stage_color_contrast(poster, args):
+    from utils.color_contrast_evaluation import ColorContrastEvaluator
+    sections = [component for component in poster.components() if component.type in TEXT_TYPES]
+
+    def run():
+        evaluator = ColorContrastEvaluator(poster.image, os.path.join(poster.directory, "contrast"),
+                                           mode=args.contrast_mode)
+        for component in sections:
+            evaluator.evaluate_section(component.type, *component.bbox, component.image)
+        evaluator.save_result()
+        return evaluator.get_results()
+    return run
+
+
+def stage_ocr(poster, args):
+    return lambda: OcrIndex.from_image(poster.image)
+
+
+def stage_hyperlinks(poster, args):
+    from utils.hyperlink import evaluateLink, link_cache
+    link_cache.clear()
+    ocr = poster.ocr()
+    return lambda: evaluateLink(poster.path, ocr)
+
+
+def stage_font_sizes(poster, args):
+    from utils.font_size import check_text_font_sizes
+    components, ocr = poster.components(), poster.ocr()
+    return lambda: check_text_font_sizes(poster.path, components, ocr)
+
+
+def stage_captions(poster, args):
+    from utils.caption_extractor import get_image_captions
+    components = poster.components()
+    llm_client.rate_limiter = TokenBucket(LLM_REQUESTS_PER_SECOND, LLM_BURST)
+    client = FakeLLM(latency=args.llm_latency)
+    return lambda: get_image_captions(poster.path, components, client, use_cache=False)
+
+
+def stage_authors(poster, args):
+    from utils.author_extraction import extract_authors
+    llm_client.rate_limiter = TokenBucket(LLM_REQUESTS_PER_SECOND, LLM_BURST)
+    client = FakeLLM(latency=args.llm_latency)
+    return lambda: extract_authors(poster.path, client, use_cache=False)
+
+
+def stage_full(poster, args):
+    from utils.evaluation import run_evaluation
+    from utils.hyperlink import link_cache
+    link_cache.clear()
+    llm_client.rate_limiter = TokenBucket(LLM_REQUESTS_PER_SECOND, LLM_BURST)
+    llm_client.set_client_factory(FakeLLM.factory(latency=args.llm_latency))
+    workspace = Workspace(root=os.path.join(poster.directory, "workspaces"))
+    return lambda: run_evaluation(poster.path, workspace, use_cache=False)
+
+
+STAGES = {
+    "extract_components": stage_extract_components,
+    "color_contrast": stage_color_contrast,
+    "ocr": stage_ocr,
+    "hyperlinks": stage_hyperlinks,
+    "font_sizes": stage_font_sizes,
+    "captions": stage_captions,
+    "authors": stage_authors,
+    "full": stage_full,
+}
+
+
+def measure(stage, posters, args):
+    """Run a stage repeat times on every poster and summarize the timings"""
+    walls, cpus = [], []
+    with PeakRSS() as rss:
+        for _ in range(args.repeat):
+            for poster in posters:
+                run = stage(poster, args)
+                wall, cpu = time.perf_counter(), time.process_time()
+                run()
+                walls.append(time.perf_counter() - wall)
+                cpus.append(time.process_time() - cpu)
+    return {
+        "status": "done",
+        "runs": len(walls),
+        "wall_seconds": {"median": round(statistics.median(walls), 4), "min": round(min(walls), 4),
+                         "max": round(max(walls), 4)},
+        "cpu_seconds": round(statistics.median(cpus), 4),
+        "rss_growth_mb": round(rss.growth / 2 ** 20, 1),
+        "process_rss_mb": round(rss.peak / 2 ** 20, 1),
+        "posters_per_second": round(len(walls) / sum(walls), 3),
+    }
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """Median wall time of each stage relative to the baseline.
+
+    A stage regresses when it is more than tolerance slower, and by at least
+    min_delta seconds, so millisecond stages don't flag on timer noise.
+    """
+    comparison = {}
+    for name, stage in results["stages"].items():
+        before = baseline.get("stages", {}).get(name, {})
+        if stage["status"] != "done" or before.get("status") != "done":
+            continue
+        ratio = stage["wall_seconds"]["median"] / max(before["wall_seconds"]["median"], 1e-9)
+        delta = stage["wall_seconds"]["median"] - before["wall_seconds"]["median"]
+        if abs(delta) < min_delta:
+            verdict = "unchanged"
+        elif ratio > 1 + tolerance:
+            verdict = "regression"
+        elif ratio < 1 - tolerance:
+            verdict = "faster"
+        else:
+            verdict = "unchanged"
+        comparison[name] = {"ratio": round(ratio, 3), "verdict": verdict,
+                            "baseline_seconds": before["wall_seconds"]["median"]}
+        if "rss_growth_mb" in before:
+            comparison[name]["rss_delta_mb"] = round(stage["rss_growth_mb"] - before["rss_growth_mb"], 1)
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=3600)
+    parser.add_argument("--height", type=int, default=2400)
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--density", type=float, default=1.0, help="scales text lines and figures per column")
+    parser.add_argument("--posters", type=int, default=3, help="synthetic posters, each with its own seed")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--contrast-mode", choices=["palette", "kmeans"], default="palette")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="fake Gemini response time")
+    parser.add_argument("--output", help="write the results as JSON, e.g. to save a baseline")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown before a stage regresses")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="smallest slowdown in seconds that counts")
+    args = parser.parse_args()
+    # Every run asks the fake client, instead of answering from the on-disk cache
+    llm_cache.llm_cache = None
+
+    results = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "args": vars(args),
+        "stages": {},
+    }
+    with tempfile.TemporaryDirectory() as directory, StandInServer() as server, route_links_to(server):
+        posters = [SyntheticPoster(directory, i, args) for i in range(args.posters)]
+        for name in args.stages:
+            try:
+                results["stages"][name] = measure(STAGES[name], posters, args)
+            except (ImportError, OSError, RuntimeError, AnalyzerFailed) as e:
+                # Missing packages, model files (RuntimeError from the model registry) or the Tesseract
+                # binary, and the full evaluation failing on any of them
+                results["stages"][name] = {"status": "skipped", "reason": f"{type(e).__name__}: {e}"}
+            stage = results["stages"][name]
+            if stage["status"] == "done":
+                print(f"{name:20s} {stage['wall_seconds']['median']:8.3f} s  cpu {stage['cpu_seconds']:8.3f} s  "
+                      f"rss +{stage['rss_growth_mb']:6.1f} MB  {stage['posters_per_second']:7.2f} posters/s",
+                      file=sys.stderr)
+            else:
+                print(f"{name:20s} skipped ({stage['reason']})", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["comparison"] = compare(results, json.load(f), args.tolerance, args.min_delta)
+        for name, entry in results["comparison"].items():
+            print(f"{name:20s} {entry['ratio']:6.2f}x baseline  {entry['verdict']}", file=sys.stderr)
+            if entry["verdict"] == "regression":
+                regressions.append(name)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if regressions:
+        sys.exit(f"Slower than the baseline: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
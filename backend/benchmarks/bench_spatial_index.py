@@ -0,0 +1,108 @@
+"""Micro-benchmark of the GridIndex region queries against the linear scans they replace.
+
+Run from the backend directory:
+    python -m benchmarks.bench_spatial_index --words 5000 --queries 200
+"""
+import argparse
+import math
+import random
+import time
+from utils.ocr import OcrIndex
+
+
+def synthetic_ocr_data(word_count, width, height, seed):
+    """Tesseract-style image_to_data output with words laid out in text lines"""
+    rng = random.Random(seed)
+    data = {key: [] for key in ('text', 'conf', 'left', 'top', 'width', 'height',
+                                'block_num', 'par_num', 'line_num')}
+    x, y, line, line_height = 0, 0, 1, 24
+    for _ in range(word_count):
+        word_width = rng.randint(20, 120)
+        if x + word_width > width:
+            x, y, line = 0, y + line_height + 8, line + 1
+        if y + line_height > height:
+            y = 0
+        data['text'].append("word")
+        data['conf'].append(rng.randint(30, 99))
+        data['left'].append(x)
+        data['top'].append(y)
+        data['width'].append(word_width)
+        data['height'].append(line_height)
+        data['block_num'].append(1 + line // 10)
+        data['par_num'].append(1)
+        data['line_num'].append(line)
+        x += word_width + 10
+    return data
+
+
+def linear_words_in(words, bbox):
+    x1, y1, x2, y2 = bbox
+    found = []
+    for word in words:
+        x, y = word.center
+        if x1 <= x < x2 and y1 <= y < y2:
+            found.append(word)
+    return found
+
+
+def linear_nearest(points, target):
+    best, best_distance = None, math.inf
+    for point in points:
+        distance = math.hypot(point[0] - target[0], point[1] - target[1])
+        if distance < best_distance:
+            best, best_distance = point, distance
+    return best_distance, best
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--width", type=int, default=7200)
+    parser.add_argument("--height", type=int, default=4800)
+    parser.add_argument("--cell-size", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = synthetic_ocr_data(args.words, args.width, args.height, args.seed)
+
+    build_seconds, index = timed(lambda: OcrIndex(data, cell_size=args.cell_size), 1)
+
+    regions = []
+    for _ in range(args.queries):
+        w, h = rng.randint(200, 1600), rng.randint(100, 800)
+        x, y = rng.randint(0, args.width - w), rng.randint(0, args.height - h)
+        regions.append((x, y, x + w, y + h))
+
+    linear_seconds, linear_result = timed(
+        lambda: [linear_words_in(index.words, region) for region in regions], args.repeat)
+    grid_seconds, grid_result = timed(
+        lambda: [index.words_in(region) for region in regions], args.repeat)
+    assert linear_result == grid_result, "grid query returned different words"
+
+    points = [word.center for word in index.words]
+    targets = [(rng.uniform(0, args.width), rng.uniform(0, args.height)) for _ in range(args.queries)]
+    linear_nn_seconds, linear_nn = timed(lambda: [linear_nearest(points, t)[0] for t in targets], args.repeat)
+    grid_nn_seconds, grid_nn = timed(
+        lambda: [index.grid.nearest(t, k=1)[0][0] for t in targets], args.repeat)
+    assert all(math.isclose(a, b) for a, b in zip(linear_nn, grid_nn)), "nearest query disagrees"
+
+    print(f"{len(index.words)} words, {args.queries} queries, cell size {args.cell_size}px")
+    print(f"index build:            {build_seconds * 1000:8.2f} ms")
+    print(f"words in region linear: {linear_seconds * 1000:8.2f} ms")
+    print(f"words in region grid:   {grid_seconds * 1000:8.2f} ms  ({linear_seconds / grid_seconds:.1f}x)")
+    print(f"nearest linear:         {linear_nn_seconds * 1000:8.2f} ms")
+    print(f"nearest grid:           {grid_nn_seconds * 1000:8.2f} ms  ({linear_nn_seconds / grid_nn_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
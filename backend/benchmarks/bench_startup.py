@@ -0,0 +1,132 @@
+"""Startup cost of the backend: time to import app and answer /health, broken down by module.
+
+Each run imports the app in a fresh interpreter with -X importtime and lets the
+background warm-up finish before exiting. Imports made after startup, e.g. by the
+warm-up, are listed separately; --wait-models also times it. Run from the backend
+directory:
+    python -m benchmarks.bench_startup --repeat 5 --top 15
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+MARKER = "--- app ready ---"
+
+# Runs in the child interpreter
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import {module} as entry
+imported = time.perf_counter() - start
+status = entry.app.test_client().get("/health").status_code
+ready = time.perf_counter() - start
+sys.stderr.write("{marker}\\n")
+sys.stderr.flush()
+models = None
+# Always let the warm-up finish before exiting, it is only timed with --wait-models
+if getattr(entry, "warmup", None) is not None:
+    entry.warmup.wait()
+    if {wait_models}:
+        models = time.perf_counter() - start
+print(json.dumps({{"import_seconds": imported, "health_seconds": ready, "health_status": status,
+                  "warmed_up_seconds": models}}))
+"""
+
+
+def parse_importtime(lines):
+    """{module: (self seconds, cumulative seconds, depth)} from -X importtime output"""
+    modules = {}
+    for line in lines:
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules[name] = (int(own) / 1e6, int(cumulative) / 1e6, len(indent) // 2)
+    return modules
+
+
+def run_once(module, wait_models):
+    code = CHILD.format(module=module, marker=MARKER, wait_models=wait_models)
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    # A failing warm-up step isn't retried, the child would otherwise sit out the backoff
+    env.setdefault("WARMUP_ATTEMPTS", "1")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                            env=env)
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    stderr = result.stderr.splitlines()
+    split = stderr.index(MARKER) if MARKER in stderr else len(stderr)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, parse_importtime(stderr[:split]), parse_importtime(stderr[split:])
+
+
+def by_package(modules):
+    """Self time summed per top-level package"""
+    packages = {}
+    for name, (own, _, _) in modules.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + own
+    return packages
+
+
+def median_of(runs):
+    """Median of each name's value across runs, counting runs without it as 0"""
+    names = set().union(*runs)
+    return {name: statistics.median(run.get(name, 0.0) for run in runs)
+            for name in names}
+
+
+def top(values, count):
+    return [{"name": name, "seconds": round(seconds, 4)}
+            for name, seconds in sorted(values.items(), key=lambda item: item[1], reverse=True)[:count]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app", help="module exposing the Flask app")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--wait-models", action="store_true", help="also time the background model loading and warm-up")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    runs = [run_once(args.module, args.wait_models) for _ in range(args.repeat)]
+    timings = {key: statistics.median(run[0][key] for run in runs if run[0][key] is not None)
+               for key in ("import_seconds", "health_seconds", "warmed_up_seconds")
+               if any(run[0][key] is not None for run in runs)}
+    # Cumulative time of what the interpreter and the entry module import directly, and of every utils module
+    direct = [{name: value[1] for name, value in run[1].items() if value[2] <= 1 and name != args.module}
+              for run in runs]
+    first_party = [{name: value[1] for name, value in run[1].items() if name.split(".")[0] == "utils"}
+                   for run in runs]
+    results = {
+        "runs": args.repeat,
+        "timings": {key: round(value, 3) for key, value in timings.items()},
+        "startup_packages": top(median_of([by_package(run[1]) for run in runs]), args.top),
+        "startup_imports": top(median_of(direct), args.top),
+        "first_party_imports": top(median_of(first_party), args.top),
+        "deferred_packages": top(median_of([by_package(run[2]) for run in runs]), args.top),
+    }
+
+    for key, value in results["timings"].items():
+        print(f"{key:24s} {value:8.3f} s", file=sys.stderr)
+    for title, key in (("Startup self time by package", "startup_packages"),
+                       ("Slowest direct imports at startup (cumulative)", "startup_imports"),
+                       ("utils modules at startup (cumulative)", "first_party_imports"),
+                       ("Imported after startup, by package", "deferred_packages")):
+        if results[key]:
+            print(f"\n{title}:", file=sys.stderr)
+            for row in results[key]:
+                print(f"  {row['name']:40s} {row['seconds'] * 1000:9.1f} ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Offline stand-in for the Gemini client.
+
+Install it with llm_client.set_client_factory(FakeLLM.factory(...)) so the caption
+and author analyzers run without an API key or network access.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class ResourceExhausted(Exception):
+    """Same class name as the google.api_core 429 error, so retries kick in"""
+
+
+def image_caption(image):
+    """Stand-in caption that depends only on the crop, so every request mode agrees"""
+    data = image["data"] if isinstance(image, dict) else image.tobytes()
+    return f"Figure {hashlib.md5(data).hexdigest()[:8]}"
+
+
+def default_reply(parts, call, drop=()):
+    """Author names for author requests, a caption for single-crop requests, a JSON mapping for batched ones"""
+    if any(isinstance(part, str) and '"authors"' in part for part in parts):
+        return '```json\n{"authors": ["Ada Lovelace", "Alan Turing"]}\n```'
+    labels = [(i, re.match(r"Component (\S+) at", part)) for i, part in enumerate(parts) if isinstance(part, str)]
+    labels = [(i, match.group(1)) for i, match in labels if match]
+    if labels:
+        return "```json\n" + json.dumps({
+            name: image_caption(parts[i + 1]) for i, name in labels if name not in drop
+        }) + "\n```"
+    return image_caption(parts[1])
+
+
+class FakeLLM:
+    def __init__(self, latency=0.5, rate_limit_every=0, reply=None, drop=(), latency_per_image=0.0):
+        self.latency = latency
+        self.latency_per_image = latency_per_image
+        self.rate_limit_every = rate_limit_every
+        self.reply = reply or (lambda parts, call: default_reply(parts, call, drop))
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def factory(cls, **kwargs):
+        client = cls(**kwargs)
+        return lambda model_name: client
+
+    def generate_content(self, parts):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            images = sum(not isinstance(part, str) for part in parts)
+            time.sleep(self.latency + self.latency_per_image * images)
+            if self.rate_limit_every and call % self.rate_limit_every == 0:
+                raise ResourceExhausted("429 Resource has been exhausted (e.g. check quota).")
+            return FakeResponse(self.reply(parts, call))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
@@ -0,0 +1,89 @@
+"""Local HTTP stand-in for the hosts a poster links to.
+
+Paths simulate the cases the link checker has to handle:
+    /ok                200
+    /slow/<seconds>    200 after a delay
+    /redirect/<n>      n redirects, then /ok
+    /fail              500
+    /missing           404
+"""
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if parts[0] == 'ok':
+            self.send_response(200)
+        elif parts[0] == 'slow':
+            time.sleep(float(parts[1]) if len(parts) > 1 else 1.0)
+            self.send_response(200)
+        elif parts[0] == 'redirect':
+            remaining = int(parts[1]) if len(parts) > 1 else 1
+            self.send_response(302)
+            self.send_header('Location', f'/redirect/{remaining - 1}' if remaining > 1 else '/ok')
+        elif parts[0] == 'fail':
+            self.send_response(500)
+        else:
+            self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Runs the stand-in on a free localhost port in a background thread"""
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        return self
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StandInAdapter(HTTPAdapter):
+    """Sends every request to the stand-in. Paths it knows are kept, anything else gets /ok"""
+
+    def __init__(self, server, **kwargs):
+        self.standin = server
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        path = urlsplit(request.url).path.strip('/')
+        known = path.split('/')[0] in ('ok', 'slow', 'redirect', 'fail', 'missing')
+        request.url = self.standin.url(path if known else 'ok')
+        return super().send(request, **kwargs)
+
+
+@contextmanager
+def route_links_to(server):
+    """Point utils.hyperlink's shared session at the stand-in server for the duration"""
+    from utils import hyperlink
+    session = hyperlink._session
+    adapters = dict(session.adapters)
+    adapter = StandInAdapter(server)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    try:
+        yield session
+    finally:
+        session.adapters.clear()
+        session.adapters.update(adapters)
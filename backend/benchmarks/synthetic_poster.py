@@ -0,0 +1,184 @@
+"""Synthetic research posters rendered with PIL, with their ground-truth layout.
+
+The layout lists every block as {"type", "bbox"} using the component types of the
+analyzers, and words every rendered word as {"text", "bbox", "line"}, so stages
+can be benchmarked without running YOLO or Tesseract first.
+    python -m benchmarks.synthetic_poster --width 3600 --height 2400 --output poster.png
+"""
+import argparse
+import random
+from PIL import Image, ImageDraw, ImageFont
+
+WORDS = ("model data results method accuracy training network evaluation learning analysis "
+         "baseline images dataset performance features proposed approach layer samples error "
+         "study significant compared experiments metric robust signal patients outcomes").split()
+NAMES = ["Ada Lovelace", "Alan Turing", "Grace Hopper", "Claude Shannon", "Katherine Johnson",
+         "John von Neumann", "Barbara Liskov", "Donald Knuth"]
+URLS = ["github.com/lab/project", "example.org/paper", "university.edu/poster", "dataset.io/download"]
+FIGURE_TYPES = ["bar_graphs", "pie_chart", "line_graph", "diagram", "table"]
+
+
+def font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _draw_text(draw, xy, text, text_font, fill, words):
+    """Draw text and record the box of each word"""
+    draw.text(xy, text, fill=fill, font=text_font)
+    line = words[-1]["line"] + 1 if words else 0
+    offset = 0
+    for word in text.split(" "):
+        x1, y1, x2, y2 = draw.textbbox((xy[0] + offset, xy[1]), word, font=text_font)
+        words.append({"text": word, "bbox": (int(x1), int(y1), int(x2), int(y2)), "line": line})
+        offset += draw.textlength(word + " ", font=text_font)
+
+
+def _line(rng, draw, text_font, width):
+    """Random words filling at most width pixels"""
+    words = [rng.choice(WORDS)]
+    while True:
+        word = rng.choice(URLS) if rng.random() < 0.03 else rng.choice(WORDS)
+        if draw.textlength(" ".join(words + [word]), font=text_font) > width:
+            return " ".join(words)
+        words.append(word)
+
+
+def _draw_chart(draw, rng, kind, box, color):
+    x1, y1, x2, y2 = box
+    draw.rectangle(box, fill=(255, 255, 255), outline=(60, 60, 60), width=3)
+    pad = (x2 - x1) // 10
+    if kind == "bar_graphs":
+        bars = rng.randint(4, 8)
+        width = (x2 - x1 - 2 * pad) // bars
+        for i in range(bars):
+            top = rng.randint(y1 + pad, y2 - pad - 10)
+            draw.rectangle((x1 + pad + i * width + 4, top, x1 + pad + (i + 1) * width - 4, y2 - pad), fill=color)
+    elif kind == "pie_chart":
+        start = 0
+        for _ in range(rng.randint(3, 6)):
+            end = min(360, start + rng.randint(40, 140))
+            shade = tuple(max(0, min(255, c + rng.randint(-80, 80))) for c in color)
+            draw.pieslice((x1 + pad, y1 + pad, x2 - pad, y2 - pad), start, end, fill=shade, outline=(255, 255, 255))
+            start = end
+    elif kind == "line_graph":
+        points = [(x1 + pad + i * (x2 - x1 - 2 * pad) // 9, rng.randint(y1 + pad, y2 - pad)) for i in range(10)]
+        draw.line(points, fill=color, width=6)
+        draw.line((x1 + pad, y2 - pad, x2 - pad, y2 - pad), fill=(0, 0, 0), width=3)
+        draw.line((x1 + pad, y1 + pad, x1 + pad, y2 - pad), fill=(0, 0, 0), width=3)
+    elif kind == "table":
+        rows, cols = rng.randint(4, 7), rng.randint(3, 5)
+        cell_font = font(max(12, (y2 - y1) // (rows * 3)))
+        for r in range(rows + 1):
+            y = y1 + pad + r * (y2 - y1 - 2 * pad) // rows
+            draw.line((x1 + pad, y, x2 - pad, y), fill=(0, 0, 0), width=2)
+        for r in range(rows):
+            for c in range(cols):
+                x = x1 + pad + c * (x2 - x1 - 2 * pad) // cols + 6
+                y = y1 + pad + r * (y2 - y1 - 2 * pad) // rows + 4
+                draw.text((x, y), f"{rng.random():.2f}", fill=(0, 0, 0), font=cell_font)
+    else:
+        # Diagram: boxes joined by arrows
+        centers = []
+        for i in range(4):
+            cx = x1 + pad + (i % 2) * (x2 - x1 - 2 * pad) // 2 + (x2 - x1) // 6
+            cy = y1 + pad + (i // 2) * (y2 - y1 - 2 * pad) // 2 + (y2 - y1) // 8
+            draw.rounded_rectangle((cx - 60, cy - 30, cx + 60, cy + 30), radius=10, fill=color, outline=(0, 0, 0))
+            centers.append((cx, cy))
+        for a, b in zip(centers, centers[1:]):
+            draw.line((a, b), fill=(0, 0, 0), width=3)
+
+
+def make_poster(width=3600, height=2400, columns=3, density=1.0, seed=0):
+    """Render a poster and return (PIL image, layout, words)"""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), (250, 250, 246))
+    draw = ImageDraw.Draw(image)
+    layout, words = [], []
+    accent = (rng.randint(20, 120), rng.randint(40, 140), rng.randint(120, 200))
+    unit = max(12, height // 120)
+
+    # Header: title, authors and a logo in each corner
+    header = int(height * 0.16)
+    draw.rectangle((0, 0, width, header), fill=accent)
+    title_box = (int(width * 0.15), unit * 2, int(width * 0.85), unit * 2 + unit * 4)
+    _draw_text(draw, title_box[:2], _sentence(rng, 7).title(), font(unit * 4), (255, 255, 255), words)
+    layout.append({"type": "title", "bbox": title_box})
+    authors_box = (int(width * 0.15), title_box[3] + unit * 2, int(width * 0.85), title_box[3] + unit * 5)
+    _draw_text(draw, authors_box[:2], ", ".join(rng.sample(NAMES, 4)), font(unit * 2), (235, 235, 235), words)
+    layout.append({"type": "authors", "bbox": authors_box})
+    for lx in (unit * 2, width - unit * 2 - header + unit * 4):
+        logo_box = (lx, unit * 2, lx + header - unit * 4, header - unit * 2)
+        draw.ellipse(logo_box, fill=(255, 255, 255))
+        draw.text((logo_box[0] + unit * 2, logo_box[1] + unit * 3), "LAB", fill=accent, font=font(unit * 3))
+        layout.append({"type": "logo", "bbox": logo_box})
+
+    # Columns of headed sections with text, figures and captions
+    margin = unit * 3
+    column_width = (width - margin * (columns + 1)) // columns
+    text_font = font(unit * 2)
+    counts = {}
+    for column in range(columns):
+        x1 = margin + column * (column_width + margin)
+        y = header + margin
+        while True:
+            heading_box = (x1, y, x1 + column_width, y + int(unit * 3.5))
+            lines = max(2, int(rng.randint(4, 9) * density))
+            text_top = heading_box[3] + unit
+            text_box = (x1, text_top, x1 + column_width, text_top + lines * int(unit * 2.6))
+            if text_box[3] > height - margin:
+                break
+            _draw_text(draw, heading_box[:2], _sentence(rng, 2).title(), font(unit * 3), accent, words)
+            layout.append({"type": "heading", "bbox": heading_box})
+            y = text_top
+            # Some sections sit on a tinted, sometimes low-contrast background
+            if rng.random() < 0.3:
+                draw.rectangle(text_box, fill=(rng.randint(150, 240),) * 3)
+            for line in range(lines):
+                _draw_text(draw, (x1 + unit, y + line * int(unit * 2.6)),
+                           _line(rng, draw, text_font, column_width - 2 * unit), text_font, (20, 20, 20), words)
+            layout.append({"type": "plain_text", "bbox": text_box})
+            y = text_box[3] + unit * 2
+
+            if rng.random() < 0.6 * density:
+                kind = rng.choice(FIGURE_TYPES)
+                figure_height = int(column_width * rng.uniform(0.45, 0.7))
+                figure_box = (x1 + unit * 2, y, x1 + column_width - unit * 2, y + figure_height)
+                caption_box = (x1, figure_box[3] + unit, x1 + column_width, figure_box[3] + unit * 4)
+                if caption_box[3] > height - margin:
+                    break
+                _draw_chart(draw, rng, kind, figure_box, accent)
+                counts[kind] = counts.get(kind, 0) + 1
+                _draw_text(draw, caption_box[:2], f"Figure {sum(counts.values())}: {_sentence(rng, 6)}",
+                           font(int(unit * 1.6)), (60, 60, 60), words)
+                layout.append({"type": kind, "bbox": figure_box})
+                layout.append({"type": "caption", "bbox": caption_box})
+                y = caption_box[3] + unit * 2
+
+    return image, layout, words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=3600)
+    parser.add_argument("--height", type=int, default=2400)
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--density", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="synthetic_poster.png")
+    args = parser.parse_args()
+
+    image, layout, words = make_poster(args.width, args.height, args.columns, args.density, args.seed)
+    image.save(args.output)
+    print(f"{args.output}: {len(layout)} blocks, {len(words)} words")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Evaluate a collection of posters without the Flask server.
+
+Writes one JSON line per poster ({"path", "report", "seconds"} or {"path", "error"}).
+Run from the backend directory:
+    python cli.py posters/ "archive/**/*.png" --workers 4 --output reports.jsonl --resume --offline
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.config import WORKSPACES_DIR
+
+POSTER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tif', '.tiff')
+# Analyzers that call out to the network: link checks and Gemini (and the poster payload prepared for it)
+NETWORK_ANALYZERS = ["hyperlinks", "llm_poster", "authors", "captions"]
+
+# Per worker process state, set by _init_worker
+_worker = {}
+
+
+def collect_posters(inputs, file_list=None):
+    """Poster paths from files, directories (searched recursively), globs and a list file, without duplicates"""
+    candidates = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                candidates.extend(os.path.join(root, name) for name in sorted(files))
+        elif glob.has_magic(item):
+            candidates.extend(sorted(glob.glob(item, recursive=True)))
+        else:
+            candidates.append(item)
+    if file_list:
+        with open(file_list) as f:
+            candidates.extend(line.strip() for line in f if line.strip())
+
+    posters, seen = [], set()
+    for path in candidates:
+        path = os.path.abspath(path)
+        if path not in seen and path.lower().endswith(POSTER_EXTENSIONS) and os.path.isfile(path):
+            seen.add(path)
+            posters.append(path)
+    return posters
+
+
+def completed_posters(output_path, retry_failed=False):
+    """Paths already written to an earlier output file"""
+    done = set()
+    if not output_path or not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Line cut short by an interrupted run
+                continue
+            if "report" in entry or not retry_failed:
+                done.add(entry.get("path"))
+    return done
+
+
+def _init_worker(skip, workspaces_dir, keep_artifacts, torch_threads):
+    """Load the models once per worker process"""
+    import torch
+    from utils.model_registry import model_registry
+    # Without this every worker would use all cores for YOLO
+    torch.set_num_threads(torch_threads)
+    model_registry.load_all()
+    _worker.update(skip=skip, workspaces_dir=workspaces_dir, keep_artifacts=keep_artifacts)
+
+
+def _local_artifacts(value, keep):
+    """The report with its get-image URLs turned into file paths, or None for artifacts that were deleted"""
+    if isinstance(value, dict):
+        return {key: _local_artifacts(item, keep) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_local_artifacts(item, keep) for item in value]
+    if isinstance(value, str) and value.startswith("get-image/"):
+        # image_url() makes them relative to utils
+        return os.path.abspath(os.path.join("utils", value[len("get-image/"):])) if keep else None
+    return value
+
+
+def _evaluate(path):
+    from utils.evaluation import run_evaluation
+    from utils.workspace import Workspace
+
+    workspace = Workspace(root=_worker["workspaces_dir"])
+    start = time.perf_counter()
+    try:
+        report = _local_artifacts(run_evaluation(path, workspace, skip=_worker["skip"]), _worker["keep_artifacts"])
+        return {"path": path, "report": report, "seconds": round(time.perf_counter() - start, 3)}
+    except Exception as e:
+        return {"path": path, "error": str(e), "seconds": round(time.perf_counter() - start, 3)}
+    finally:
+        if not _worker["keep_artifacts"]:
+            workspace.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="*", help="poster files, directories or glob patterns")
+    parser.add_argument("--file-list", help="text file with one poster path per line")
+    parser.add_argument("--output", "-o", help="JSONL file to append to (default: stdout)")
+    parser.add_argument("--workers", "-w", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="worker processes, each with its own copy of the models")
+    parser.add_argument("--resume", action="store_true", help="skip posters already in the output file")
+    parser.add_argument("--retry-failed", action="store_true", help="with --resume, evaluate failed posters again")
+    parser.add_argument("--offline", action="store_true", help="skip the link checks and Gemini analyzers")
+    parser.add_argument("--skip", action="append", default=[], help="analyzer to leave out (repeatable)")
+    parser.add_argument("--workspaces", default=WORKSPACES_DIR, help="where component images are written")
+    parser.add_argument("--keep-artifacts", action="store_true",
+                        help="keep the images referenced by each report, which then holds their paths, "
+                             "instead of deleting them")
+    args = parser.parse_args()
+
+    posters = collect_posters(args.inputs, args.file_list)
+    if args.resume:
+        done = completed_posters(args.output, args.retry_failed)
+        posters = [path for path in posters if path not in done]
+    if not posters:
+        print("No posters to evaluate", file=sys.stderr)
+        return
+
+    skip = list(args.skip) + (NETWORK_ANALYZERS if args.offline else [])
+    output = open(args.output, "a+") if args.output else sys.stdout
+    if output is not sys.stdout and output.tell() > 0:
+        output.seek(output.tell() - 1)
+        if output.read(1) != "\n":
+            # Finish the line an interrupted run left half written
+            output.write("\n")
+    # spawn keeps torch and the Tesseract/LLM client state out of forked children
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(skip, args.workspaces, args.keep_artifacts,
+                                           max(1, (os.cpu_count() or 1) // args.workers))) as executor:
+            futures = [executor.submit(_evaluate, path) for path in posters]
+            for count, future in enumerate(as_completed(futures), 1):
+                entry = future.result()
+                failed += "error" in entry
+                output.write(json.dumps(entry, default=str) + "\n")
+                output.flush()
+                print(f"[{count}/{len(posters)}] {entry['path']} {'failed' if 'error' in entry else 'done'} "
+                      f"in {entry['seconds']}s", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(posters)} posters ({failed} failed) in {elapsed:.1f}s, "
+          f"{len(posters) / elapsed:.2f} posters/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Link checker against the local stand-in server, no network needed"""
+import time
+import pytest
+from benchmarks.link_standin import StandInServer
+from utils.hyperlink import LinkCache, check_link, check_links
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+def test_status_codes_and_redirects(server):
+    urls = [server.url(path) for path in ("ok", "redirect/3", "fail", "missing")]
+    assert check_links(urls, cache=None) == dict(zip(urls, [True, True, False, False]))
+
+
+def test_unreachable_host_is_not_working():
+    with StandInServer() as closed:
+        url = closed.url("ok")
+    assert check_links([url], cache=None) == {url: False}
+
+
+def test_duplicates_are_checked_once(server):
+    cache = LinkCache()
+    url = server.url("ok")
+    assert check_links([url, url, url], cache=cache) == {url: True}
+    assert cache.stats()["entries"] == 1
+    assert cache.misses == 1
+
+
+def test_cached_results_are_reused_until_they_expire(server):
+    cache = LinkCache(ttl=0.2)
+    url = server.url("ok")
+    check_links([url], cache=cache)
+    check_links([url], cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    time.sleep(0.3)
+    check_links([url], cache=cache)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cached_result_is_returned_without_a_request(server):
+    cache = LinkCache()
+    url = server.url("missing")
+    cache.put(url, True)
+    assert check_links([url], cache=cache) == {url: True}
+
+
+def test_deadline_counts_pending_links_as_not_working(server):
+    cache = LinkCache()
+    slow, fast = server.url("slow/1"), server.url("ok")
+    start = time.perf_counter()
+    results = check_links([slow, fast], deadline=0.3, cache=cache)
+    assert time.perf_counter() - start < 0.9
+    assert results == {slow: False, fast: True}
+    # Only finished checks are cached, the slow link is checked again next time
+    assert cache.get(slow) is None
+    assert cache.get(fast) is True
+
+
+def test_request_timeout(server):
+    start = time.perf_counter()
+    assert check_link(server.url("slow/1"), timeout=0.2) is False
+    assert time.perf_counter() - start < 0.9
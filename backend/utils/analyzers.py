@@ -0,0 +1,178 @@
+import time
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .config import ANALYZER_WORKERS
+from .metrics import analyzer_seconds
+
+
+class Analyzer:
+    """One stage of a poster evaluation.
+
+    fn(context) returns the stage's value, which later stages read from
+    context.results. requires names the analyzers that must have finished first;
+    uses names analyzers that run alongside and are only waited for part way
+    through, with context.wait(). A used analyzer is optional: skipping it, or
+    its failure, doesn't skip or fail the analyzer, context.wait() returns None
+    for it instead.
+    """
+
+    def __init__(self, name, fn, requires=(), default=None, critical=False, uses=()):
+        self.name = name
+        self.fn = fn
+        self.requires = tuple(requires)
+        self.uses = tuple(uses)
+        self.default = default
+        # A failing critical analyzer fails the whole evaluation instead of leaving a default
+        self.critical = critical
+
+
+class AnalyzerRegistry:
+    def __init__(self):
+        self.analyzers = {}
+
+    def register(self, name, requires=(), default=None, critical=False, uses=()):
+        """Decorator registering fn(context) as an analyzer.
+
+        Dependencies must be registered first. For uses this also means they are
+        handed to the thread pool before the analyzer, so waiting on them can't deadlock.
+        """
+        def decorator(fn):
+            missing = [dependency for dependency in (*requires, *uses) if dependency not in self.analyzers]
+            if missing:
+                raise ValueError(f"Analyzer {name} depends on unknown analyzers: {', '.join(missing)}")
+            self.analyzers[name] = Analyzer(name, fn, requires, default, critical, uses)
+            return fn
+        return decorator
+
+    def names(self):
+        return list(self.analyzers)
+
+    def select(self, names=None, skip=()):
+        """The analyzers in names (default all) plus their dependencies, in registration order.
+
+        Analyzers in skip, and everything requiring them, are left out. Analyzers
+        that only use a skipped one still run without it.
+        """
+        wanted = set()
+        pending = list(names if names is not None else self.analyzers)
+        while pending:
+            name = pending.pop()
+            if name not in wanted:
+                wanted.add(name)
+                pending.extend(self.analyzers[name].requires + self.analyzers[name].uses)
+
+        selected, dropped = [], set(skip)
+        for name, analyzer in self.analyzers.items():
+            if name not in wanted:
+                continue
+            if name in dropped or dropped.intersection(analyzer.requires):
+                dropped.add(name)
+            else:
+                selected.append(analyzer)
+        return selected
+
+
+class AnalyzerFailed(Exception):
+    pass
+
+
+class EvaluationContext:
+    """Inputs and results shared by the analyzers of one evaluation"""
+
+    def __init__(self, poster_path, workspace, use_cache=True, **options):
+        self.poster_path = poster_path
+        self.workspace = workspace
+        self.use_cache = use_cache
+        self.options = options
+        self.results = {}
+        # Report sections built from each finished analyzer's result
+        self.sections = {}
+        self.stages = {}
+        self._finished = {}
+
+    def wait(self, name):
+        """Block until analyzer name is finished and return its value.
+
+        For analyzers that declare name in uses, so they can start before its
+        result is ready. None if name is not part of this evaluation, failed or
+        was skipped, so the caller can do without it.
+        """
+        if name not in self._finished:
+            return None
+        self._finished[name].wait()
+        if self.stages[name]["status"] != "done":
+            return None
+        return self.results[name]
+
+
+def run_analyzers(analyzers, context, max_workers=ANALYZER_WORKERS, listener=None, profiler=None):
+    """Run the analyzers on a thread pool, each as soon as its dependencies are done.
+
+    A failing analyzer leaves its default value and its dependents are skipped;
+    the failure is recorded in context.stages. A critical failure is raised once
+    the running stages have finished. listener(name, status) is called as each
+    stage starts ("running") and ends ("done", "failed" or "skipped"). With a
+    profiler each analyzer runs inside profiler.stage(name).
+    """
+    def notify(name, status):
+        if listener:
+            listener(name, status)
+
+    def run(analyzer):
+        context.stages[analyzer.name] = {"status": "running", "started_at": round(time.perf_counter() - started_at, 3)}
+        notify(analyzer.name, "running")
+        start = time.perf_counter()
+        try:
+            if profiler:
+                with profiler.stage(analyzer.name):
+                    value = analyzer.fn(context)
+            else:
+                value = analyzer.fn(context)
+            status, error = "done", None
+        except Exception as e:
+            traceback.print_exc()
+            value, status, error = analyzer.default, "failed", str(e)
+        seconds = time.perf_counter() - start
+        analyzer_seconds.observe(seconds, analyzer.name, status)
+        context.results[analyzer.name] = value
+        context.stages[analyzer.name].update(status=status, seconds=round(seconds, 3))
+        if error:
+            context.stages[analyzer.name]["error"] = error
+        context._finished[analyzer.name].set()
+        notify(analyzer.name, status)
+        return analyzer
+
+    started_at = time.perf_counter()
+    for analyzer in analyzers:
+        context._finished[analyzer.name] = threading.Event()
+
+    pending = list(analyzers)
+    running = set()
+    failures = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyzer") as executor:
+        while pending or running:
+            for analyzer in list(pending):
+                states = [context.stages.get(name, {}).get("status") for name in analyzer.requires]
+                if any(state in ("failed", "skipped") for state in states) or failures:
+                    # A dependency failed, or the evaluation is being abandoned
+                    pending.remove(analyzer)
+                    context.results[analyzer.name] = analyzer.default
+                    context.stages[analyzer.name] = {"status": "skipped"}
+                    context._finished[analyzer.name].set()
+                    notify(analyzer.name, "skipped")
+                elif all(state == "done" for state in states):
+                    pending.remove(analyzer)
+                    running.add(executor.submit(run, analyzer))
+
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                analyzer = future.result()
+                if analyzer.critical and context.stages[analyzer.name]["status"] == "failed":
+                    failures.append(analyzer.name)
+
+    if failures:
+        raise AnalyzerFailed(f"{failures[0]} failed: {context.stages[failures[0]].get('error')}")
+    return context
@@ -1,27 +1,15 @@
-import base64
-from PIL import Image
-from io import BytesIO
-import google.generativeai as genai
-import json
-import os
+from .llm_client import get_client, generate_content, parse_json_response
+from .llm_payload import prepare_poster
 
-def extract_authors(image_path: str) -> list:
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
+def extract_authors(image_path: str, model=None, poster=None, use_cache=True) -> list:
+    model = model or get_client('gemini-1.5-flash')
+    if model is None:
         print("Warning: GEMINI_API_KEY not set. Author extraction may fail.")
         return []
-    genai.configure(api_key=api_key)
-    
-    def image_to_base64(image):
-        buffered = BytesIO()
-        image.save(buffered, format="PNG")
-        return buffered.getvalue()
     
     try:
-        img = Image.open(image_path)
-        img_data = image_to_base64(img)
-        
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        # Normally the poster payload prepared once for the whole request
+        poster = poster or prepare_poster(image_path)
         
         prompt = """Extract the author names from this research poster. 
 Return the response in the following JSON format:
@@ -34,28 +22,18 @@ If no authors are found, return:
 }
 Do not include any other text in your response, only the JSON object."""
         
-        response = model.generate_content(
+        response = generate_content(
+            model,
             [
                 prompt,
-                {
-                    "mime_type": "image/png",
-                    "data": img_data
-                }
-            ]
+                poster.part
+            ],
+            operation="authors",
+            use_cache=use_cache
         )
         
-        response_text = response.text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        try:
-            result = json.loads(response_text)
-            return result.get('authors', [])
-        except json.JSONDecodeError:
-            return []
+        result = parse_json_response(response.text)
+        return result.get('authors', []) if isinstance(result, dict) else []
     except Exception as e:
         print(f"Error extracting authors: {str(e)}")
         return []
@@ -0,0 +1,62 @@
+import threading
+from .config import LAYOUT_BATCH_SIZE
+
+
+class _Request:
+    def __init__(self, image):
+        self.image = image
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class BatchPredictor:
+    """Groups predict() calls from concurrent threads into list predictions.
+
+    Whichever caller gets the model first runs one predict over everything
+    queued so far (up to max_batch images) and hands each caller its result, so
+    posters evaluated side by side share YOLO calls without waiting on a timer.
+    """
+
+    def __init__(self, model, max_batch=LAYOUT_BATCH_SIZE, **predict_kwargs):
+        self.model = model
+        self.max_batch = max_batch
+        self.predict_kwargs = predict_kwargs
+        self.calls = 0
+        self.images = 0
+        self._queue = []
+        self._queue_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def predict(self, image):
+        """Result for a single image, as one element of model.predict(...)"""
+        request = _Request(image)
+        with self._queue_lock:
+            self._queue.append(request)
+
+        while not request.done:
+            with self._run_lock:
+                if request.done:
+                    break
+                with self._queue_lock:
+                    batch = self._queue[:self.max_batch]
+                    del self._queue[:self.max_batch]
+                self._run(batch)
+
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self, batch):
+        try:
+            results = self.model.predict([request.image for request in batch], **self.predict_kwargs)
+            for request, result in zip(batch, results):
+                request.result = result
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            self.calls += 1
+            self.images += len(batch)
+            for request in batch:
+                request.done = True
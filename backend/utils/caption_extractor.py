@@ -1,43 +1,41 @@
-import google.generativeai as genai
-from PIL import Image
 import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from .components import components_of_type, component_name
+from .config import CAPTION_CONCURRENCY, CAPTION_MODE, CAPTION_BATCH_SIZE
+from .llm_client import get_client, generate_content, parse_json_response
+from .llm_payload import prepare_image, prepare_poster
 
-def get_image_captions(poster_path: str) -> dict:
-    # Get API key from environment variable or use default
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
+# Example keys named like real components, so the model doesn't copy a pattern that never matches
+CAPTION_EXAMPLE = json.dumps({component_name("bar_graphs", 1): "Figure 1: Accuracy per model",
+                              component_name("table", 1): ""})
+
+BATCH_CAPTION_PROMPT = f"""RULES:
+1. The first image is a research poster. Every following image is a component extracted from it,
+   introduced by its name and its bounding box (x1, y1, x2, y2) in poster pixels.
+2. Your task is to find, for every component, if it has a caption in the poster.
+3. RESPONSE FORMAT:
+   - Return ONLY a JSON object mapping each component name to its exact caption text,
+     for example {CAPTION_EXAMPLE}
+   - If a component has no caption, map it to an empty string ("")
+4. DO NOT include any explanatory text outside the JSON object
+5. If you're not 100% sure it's a caption, use an empty string"""
+
+def get_image_captions(poster_path: str, components: list, model=None, poster=None, use_cache=True) -> dict:
+    model = model or get_client('gemini-1.5-flash')
+    if model is None:
         print("Warning: GEMINI_API_KEY not set. Caption extraction may fail.")
         return {}
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-1.5-flash')
     
     try:
-        raw_components_dir = os.path.join("utils", "Memory", "Raw Components")
-        if not os.path.exists(raw_components_dir):
-            return {}
-            
-        files = os.listdir(raw_components_dir)
-        components = []
-        
-        for file_name in files:
-            if (
-                file_name.startswith("bar_graphs_") or
-                file_name.startswith("pie_chart_") or
-                file_name.startswith("line_graph_") or
-                file_name.startswith("diagram_") or
-                file_name.startswith("table_")
-            ):
-                full_path = os.path.join(raw_components_dir, file_name)
-                components.append(full_path)
-        
-        return process_captions(poster_path, components, model)
+        return process_captions(poster_path, components, model, poster=poster, use_cache=use_cache)
     except Exception as e:
         print(f"Error getting image captions: {str(e)}")
         return {}
 
-def get_caption(poster_image: Image, component_image: Image, model) -> str:
+def get_caption(poster_image: dict, component_image: dict, model, use_cache: bool = True) -> str:
     try:
-        response = model.generate_content([
+        response = generate_content(model, [
             poster_image, 
             component_image, 
             """RULES:
@@ -50,7 +48,7 @@ def get_caption(poster_image: Image, component_image: Image, model) -> str:
    - "Here's the caption"
    - "The caption is"
 5. If you're not 100% sure it's a caption, return empty string"""
-        ])
+        ], operation="caption", use_cache=use_cache)
         text = response.text.strip()
         
         return text
@@ -58,43 +56,88 @@ def get_caption(poster_image: Image, component_image: Image, model) -> str:
         print(f"Error generating caption: {str(e)}")
         return ""
 
-def process_captions(poster_path: str, component_paths: list = None, model = None) -> dict:
-    if not os.path.exists(poster_path) or component_paths is None:
+def get_captions_batch(poster, components: list, component_images: list, model, use_cache: bool = True) -> dict:
+    """Captions of several components from a single request, as {component name: caption}.
+
+    Bounding boxes are given in the coordinates of the (possibly downscaled) poster payload.
+
+    Only answers for components that were actually sent are kept, so the caller
+    can fall back to get_caption for everything missing.
+    """
+    parts = [poster.part]
+    for component, component_image in zip(components, component_images):
+        parts.append(f"Component {component.name} at {tuple(round(v * poster.scale) for v in component.bbox)}:")
+        parts.append(component_image)
+    parts.append(BATCH_CAPTION_PROMPT)
+
+    try:
+        response = generate_content(model, parts, operation="caption_batch", use_cache=use_cache)
+        answer = parse_json_response(response.text)
+    except Exception as e:
+        print(f"Error generating batch captions: {str(e)}")
         return {}
-        
-    patterns = {
-        'bar_graphs': 'bar_graphs_',
-        'pie_chart': 'pie_chart_',
-        'line_graph': 'line_graph_',
-        'diagram': 'diagram_',
-        'table': 'table_'
+
+    if not isinstance(answer, dict):
+        print("Batch caption response is not a JSON object, falling back to per-component requests")
+        return {}
+    names = {component.name for component in components}
+    return {
+        name: caption.strip()
+        for name, caption in answer.items()
+        if name in names and isinstance(caption, str)
     }
+
+def process_captions(poster_path: str, components: list = None, model = None,
+                     max_concurrency: int = CAPTION_CONCURRENCY, mode: str = CAPTION_MODE, poster=None,
+                     use_cache: bool = True) -> dict:
+    if not os.path.exists(poster_path) or components is None:
+        return {}
+        
+    component_types = ['bar_graphs', 'pie_chart', 'line_graph', 'diagram', 'table']
     
-    poster_image = Image.open(poster_path)
+    selected = components_of_type(components, component_types)
+    if not selected:
+        return {}
+
+    # The poster payload is normally prepared once per request and shared with author extraction
+    poster = poster or prepare_poster(poster_path)
+    component_images = [prepare_image(component.image).part for component in selected]
+
+    # The requests are independent, so they run concurrently; the shared rate
+    # limiter in llm_client keeps the process under the Gemini quota
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(selected)))) as executor:
+        captions = {}
+        if mode == "batch":
+            # The poster is uploaded once per batch instead of once per component
+            batches = [
+                (selected[i:i + CAPTION_BATCH_SIZE], component_images[i:i + CAPTION_BATCH_SIZE])
+                for i in range(0, len(selected), CAPTION_BATCH_SIZE)
+            ]
+            for answer in executor.map(lambda batch: get_captions_batch(poster, *batch, model, use_cache), batches):
+                captions.update(answer)
+
+        missing = [i for i, component in enumerate(selected) if component.name not in captions]
+        fallback = executor.map(lambda i: get_caption(poster.part, component_images[i], model, use_cache), missing)
+        for i, caption in zip(missing, fallback):
+            captions[selected[i].name] = caption
+
+    # Results keep the component order regardless of which request finished first
     results = {}
-    
-    for path in component_paths:
-        if not os.path.exists(path):
-            continue
-            
-        filename = os.path.basename(path)
-        if not any(filename.startswith(pattern) for pattern in patterns.values()):
-            continue
-            
-        component_image = Image.open(path)
-        component_name = filename.replace('.jpg', '')
-        caption = get_caption(poster_image, component_image, model)
-        
-        results[component_name] = {
-            "img": f"get-image/Memory/Raw Components/{filename}",
-            "caption": caption
+    for component in selected:
+        results[component.name] = {
+            "img": component.save(),
+            "caption": captions[component.name]
         }
     
     return results
 
 if __name__ == "__main__":
-    poster = "Input/2.png"
-    results = get_image_captions(poster)
+    from utils.poster_layout import PosterComponentExtractor
+
+    poster = "utils/Input/2.png"
+    extractor = PosterComponentExtractor(poster)
+    extractor.extractComponents()
+    results = get_image_captions(poster, extractor.raw_components)
     print(results)
 
 
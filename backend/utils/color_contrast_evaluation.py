@@ -1,18 +1,42 @@
 import cv2
 import numpy as np
 import os
+from .workspace import image_url
+from .config import CONTRAST_MODE
+
+def _linearize_srgb(channel):
+    channel = channel / 255
+    return channel / 12.92 if channel <= 0.03928 else ((channel + 0.055) / 1.055) ** 2.4
+
+# Linear-light value of every 8-bit sRGB channel value
+SRGB_TO_LINEAR = np.array([_linearize_srgb(value) for value in range(256)], dtype=np.float64)
 
 def get_relative_luminance(r, g, b):
-    r, g, b = r/255, g/255, b/255
-    r = r/12.92 if r <= 0.03928 else ((r + 0.055)/1.055) ** 2.4
-    g = g/12.92 if g <= 0.03928 else ((g + 0.055)/1.055) ** 2.4
-    b = b/12.92 if b <= 0.03928 else ((b + 0.055)/1.055) ** 2.4
-    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+    """WCAG relative luminance of 8-bit RGB values; accepts scalars or integer arrays"""
+    luminance = (0.2126 * SRGB_TO_LINEAR[np.asarray(r, dtype=np.intp)]
+                 + 0.7152 * SRGB_TO_LINEAR[np.asarray(g, dtype=np.intp)]
+                 + 0.0722 * SRGB_TO_LINEAR[np.asarray(b, dtype=np.intp)])
+    return float(luminance) if luminance.ndim == 0 else luminance
 
 def calculate_contrast_ratio(text_color, background_color):
-    l1 = get_relative_luminance(*text_color)
-    l2 = get_relative_luminance(*background_color)
-    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+    """WCAG contrast ratio of two RGB colors, or of two (..., 3) arrays of colors"""
+    text_color = np.asarray(text_color)
+    background_color = np.asarray(background_color)
+    l1 = get_relative_luminance(text_color[..., 0], text_color[..., 1], text_color[..., 2])
+    l2 = get_relative_luminance(background_color[..., 0], background_color[..., 1], background_color[..., 2])
+    ratio = (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+    return float(ratio) if np.ndim(ratio) == 0 else ratio
+
+def count_edge_votes(edge_pixels, colors):
+    """Number of edge pixels strictly closer to colors[0] and to colors[1].
+
+    Distances use the same uint8 arithmetic as the original per-pixel loop
+    (differences and squares wrap around), so the votes are identical to it.
+    """
+    diffs = edge_pixels[:, None, :] - colors[None, :, :]
+    distances = np.sum(diffs ** 2, axis=2)
+    return [int(np.count_nonzero(distances[:, 0] < distances[:, 1])),
+            int(np.count_nonzero(distances[:, 1] < distances[:, 0]))]
 
 def get_dominant_colors(image):
     img_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
@@ -26,18 +50,143 @@ def get_dominant_colors(image):
     edge_pixels = np.vstack([img_rgb[:10, :].reshape(-1, 3), img_rgb[-10:, :].reshape(-1, 3),
                             img_rgb[:, :10].reshape(-1, 3), img_rgb[:, -10:].reshape(-1, 3)])
 
-    edge_votes = [sum(1 for pixel in edge_pixels if np.sum((pixel - color) ** 2) < 
-                  np.sum((pixel - other_color) ** 2)) for color, other_color in 
-                  [(colors[0], colors[1]), (colors[1], colors[0])]]
+    edge_votes = count_edge_votes(edge_pixels, colors)
 
     background_color = colors[np.argmax(edge_votes)]
     text_color = colors[1 - np.argmax(edge_votes)]
 
     return text_color, background_color
 
+class PosterPalette:
+    """Colors of the whole poster quantized once, for deterministic per-section contrast.
+
+    Every pixel is binned into a coarse 3D RGB histogram (levels per channel) and the
+    max_colors most common bins form the palette; the remaining bins are merged into
+    their nearest palette color. Per-cell label counts are summed into an integral
+    histogram, so the color histogram of any section (and of its 10 px frame) costs
+    O(palette size) instead of O(section pixels). The two dominant colors of a section
+    come from a 2-means over its palette histogram.
+    """
+
+    EDGE_WIDTH = 10
+
+    def __init__(self, image, levels=8, max_colors=32, max_cells=250000):
+        height, width = image.shape[:2]
+        self.levels = levels
+        self.shift = 8 - int(np.log2(levels))
+        self.cell_size = max(1, int(np.ceil(np.sqrt(height * width / max_cells))))
+        grid_h = -(-height // self.cell_size)
+        grid_w = -(-width // self.cell_size)
+        bin_total = levels ** 3
+
+        # The poster is processed one band of cell rows at a time to bound memory
+        bands = [image[y:y + self.cell_size] for y in range(0, height, self.cell_size)]
+
+        bin_counts = np.zeros(bin_total, dtype=np.int64)
+        channel_sums = np.zeros((bin_total, 3), dtype=np.float64)
+        for band in bands:
+            band_rgb = cv2.cvtColor(band, cv2.COLOR_BGR2RGB).reshape(-1, 3)
+            bins = self._bins(band_rgb)
+            bin_counts += np.bincount(bins, minlength=bin_total)
+            for c in range(3):
+                channel_sums[:, c] += np.bincount(bins, weights=band_rgb[:, c], minlength=bin_total)
+
+        # Most common bins first; ties broken by bin index so the palette is deterministic
+        used = np.flatnonzero(bin_counts)
+        order = used[np.lexsort((used, -bin_counts[used]))]
+        kept = order[:max_colors]
+        self.colors = channel_sums[kept] / bin_counts[kept, None]
+
+        # Map every histogram bin to its nearest palette color
+        bin_means = channel_sums / np.maximum(bin_counts, 1)[:, None]
+        distances = ((bin_means[:, None, :] - self.colors[None, :, :]) ** 2).sum(axis=2)
+        bin_to_label = np.argmin(distances, axis=1)
+        bin_to_label[kept] = np.arange(len(kept))
+
+        # Integral histogram of palette labels over cells of cell_size x cell_size pixels
+        palette_size = len(kept)
+        column_cells = np.arange(width) // self.cell_size
+        cell_counts = np.zeros((grid_h, grid_w, palette_size), dtype=np.int64)
+        for row, band in enumerate(bands):
+            band_rgb = cv2.cvtColor(band, cv2.COLOR_BGR2RGB).reshape(-1, 3)
+            labels = bin_to_label[self._bins(band_rgb)]
+            cell_index = np.tile(column_cells, len(band)) * palette_size + labels
+            cell_counts[row] = np.bincount(cell_index, minlength=grid_w * palette_size).reshape(grid_w, palette_size)
+
+        self.integral = np.zeros((grid_h + 1, grid_w + 1, palette_size), dtype=np.int32)
+        self.integral[1:, 1:] = cell_counts.cumsum(axis=0).cumsum(axis=1)
+        self.grid_shape = (grid_h, grid_w)
+
+    def _bins(self, pixels_rgb):
+        quantized = (pixels_rgb >> self.shift).astype(np.int32)
+        return (quantized[:, 0] * self.levels + quantized[:, 1]) * self.levels + quantized[:, 2]
+
+    def _cell_box(self, x1, y1, x2, y2):
+        grid_h, grid_w = self.grid_shape
+        size = self.cell_size
+        cx1, cy1 = min(int(round(x1 / size)), grid_w), min(int(round(y1 / size)), grid_h)
+        cx2, cy2 = min(int(round(x2 / size)), grid_w), min(int(round(y2 / size)), grid_h)
+        return cx1, cy1, max(cx2, cx1), max(cy2, cy1)
+
+    def _histogram(self, cx1, cy1, cx2, cy2):
+        integral = self.integral
+        return integral[cy2, cx2] - integral[cy1, cx2] - integral[cy2, cx1] + integral[cy1, cx1]
+
+    def section_histograms(self, x1, y1, x2, y2):
+        """Palette histograms of the whole section and of its edge frame"""
+        cx1, cy1, cx2, cy2 = self._cell_box(x1, y1, x2, y2)
+        section = self._histogram(cx1, cy1, cx2, cy2)
+
+        edge = max(1, int(round(self.EDGE_WIDTH / self.cell_size)))
+        ix1, iy1 = min(cx1 + edge, cx2), min(cy1 + edge, cy2)
+        ix2, iy2 = max(cx2 - edge, ix1), max(cy2 - edge, iy1)
+        frame = section - self._histogram(ix1, iy1, ix2, iy2)
+        return section, frame
+
+    def _two_means(self, histogram, iterations=20):
+        """Weighted 2-means over the palette colors, seeded deterministically"""
+        weights = histogram.astype(np.float64)
+        present = np.flatnonzero(weights)
+        first = present[np.argmax(weights[present])]
+        spread = ((self.colors[present] - self.colors[first]) ** 2).sum(axis=1) * weights[present]
+        second = present[np.argmax(spread)]
+        centers = np.stack([self.colors[first], self.colors[second]])
+
+        for _ in range(iterations):
+            distances = ((self.colors[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+            assignment = np.argmin(distances, axis=1)
+            new_centers = centers.copy()
+            for cluster in range(2):
+                mask = (assignment == cluster) & (weights > 0)
+                if weights[mask].sum() > 0:
+                    new_centers[cluster] = (self.colors[mask] * weights[mask, None]).sum(axis=0) / weights[mask].sum()
+            if np.allclose(new_centers, centers):
+                break
+            centers = new_centers
+
+        distances = ((self.colors[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        return centers, np.argmin(distances, axis=1)
+
+    def section_colors(self, x1, y1, x2, y2):
+        """Text and background color of a section, or None if it is smaller than a cell"""
+        section, frame = self.section_histograms(x1, y1, x2, y2)
+        if section.sum() == 0 or frame.sum() == 0:
+            return None
+
+        centers, assignment = self._two_means(section)
+        edge_votes = [frame[assignment == 0].sum(), frame[assignment == 1].sum()]
+
+        colors = np.uint8(centers)
+        background_color = colors[np.argmax(edge_votes)]
+        text_color = colors[1 - np.argmax(edge_votes)]
+        return text_color, background_color
+
 class ColorContrastEvaluator:
-    def __init__(self, original_image):
+    def __init__(self, original_image, output_dir="utils/Output/Color_Contrast", mode=CONTRAST_MODE):
         self.original_image = original_image.copy()
+        self.output_dir = output_dir
+        # "palette" quantizes the poster once; "kmeans" clusters every section on its own
+        self.palette = PosterPalette(original_image) if mode == "palette" else None
         self.contrast_result_image = original_image.copy()
         self.section_counter = 0
         self.color_contrast_result = []
@@ -58,7 +207,10 @@ class ColorContrastEvaluator:
 
         section_image = cropped_image.copy()
         
-        text_color, background_color = get_dominant_colors(cropped_image)
+        colors = self.palette.section_colors(x1, y1, x2, y2) if self.palette is not None else None
+        if colors is None:
+            colors = get_dominant_colors(cropped_image)
+        text_color, background_color = colors
         text_color = tuple(map(int, text_color))
         background_color = tuple(map(int, background_color))
         
@@ -85,9 +237,8 @@ class ColorContrastEvaluator:
                     (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
 
     def save_result(self):
-        output_dir = "utils/Output/Color_Contrast"
-        os.makedirs(output_dir, exist_ok=True)
-        cv2.imwrite(os.path.join(output_dir, "color_contrast_result.png"), self.contrast_result_image)
+        os.makedirs(self.output_dir, exist_ok=True)
+        cv2.imwrite(os.path.join(self.output_dir, "color_contrast_result.png"), self.contrast_result_image)
 
     def get_results(self):
         if not self.color_contrast_result:
@@ -95,17 +246,17 @@ class ColorContrastEvaluator:
 
         results = {
             'sections': [],
-            'color_contrast_summary': 'get-image/Output/Color_Contrast/color_contrast_result.png'
+            'color_contrast_summary': image_url(os.path.join(self.output_dir, 'color_contrast_result.png'))
         }
         
         for idx, section in enumerate(self.color_contrast_result):
             section_filename = f'section_{idx + 1}.png'
-            section_path = os.path.join("utils/Output/Color_Contrast", section_filename)
+            section_path = os.path.join(self.output_dir, section_filename)
             cv2.imwrite(section_path, section['section'])
             
             section_dto = {
                 'section_id': idx + 1,
-                'section_image': f'get-image/Output/Color_Contrast/{section_filename}',
+                'section_image': image_url(section_path),
                 'text_color': section['text_color'],
                 'background_color': section['background_color'],
                 'contrast_ratio': float(section['contrast_ratio']),
@@ -0,0 +1,51 @@
+import os
+import cv2
+from .workspace import image_url
+
+
+def component_name(component_type, count):
+    """Name of the count-th (1-based) component of a type, e.g. table_1"""
+    return f"{component_type}_{count}"
+
+
+class Component:
+    """A poster component found by the layout extractor.
+
+    image is a view into the original poster (BGR), so analyzers can work on it
+    directly. The crop is only encoded to disk when a report references it.
+    """
+
+    def __init__(self, component_type, count, bbox, image, directory):
+        self.type = component_type
+        self.count = count
+        self.bbox = bbox
+        self.image = image
+        self.directory = directory
+        self.image_url = None
+
+    @property
+    def name(self):
+        return component_name(self.type, self.count)
+
+    @property
+    def filename(self):
+        return f"{self.name}.jpg"
+
+    def save(self):
+        """Write the crop once and return the get-image URL that serves it"""
+        if self.image_url is None:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, self.filename)
+            cv2.imwrite(path, self.image)
+            self.image_url = image_url(path)
+        return self.image_url
+
+
+def components_of_type(components, component_types):
+    """Components whose type is in component_types, grouped in the given type order"""
+    return [
+        component
+        for component_type in component_types
+        for component in components
+        if component.type == component_type
+    ]
@@ -1,22 +1,71 @@
 import os
 
-DIRECTORIES_TO_CLEAR = [
-    "utils/Input",
-    "utils/Memory/Raw Components",
-    "utils/Output/Logos",
-    "utils/Buffer/components",
-    "utils/Output/Color_Contrast",
-    "utils/Output/"
-    # "utils/Models" is intentionally NOT included!
-]
-
-def clear_directories():
-    for directory in DIRECTORIES_TO_CLEAR:
-        if os.path.exists(directory):
-            for filename in os.listdir(directory):
-                file_path = os.path.join(directory, filename)
-                try:
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
-                except Exception:
-                    pass
+# Every evaluation writes its input and artifacts into utils/Jobs/<job_id>.
+# This has to stay under utils so the get-image route can serve the artifacts.
+WORKSPACES_DIR = os.environ.get("WORKSPACES_DIR", "utils/Jobs")
+
+# Workspaces are kept this long so the client can still fetch the report images
+WORKSPACE_TTL_SECONDS = int(os.environ.get("WORKSPACE_TTL_SECONDS", 3600))
+
+# Background evaluation jobs (POST /jobs)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_MAX_PENDING = int(os.environ.get("JOB_MAX_PENDING", 16))
+JOB_RESULT_TTL_SECONDS = int(os.environ.get("JOB_RESULT_TTL_SECONDS", WORKSPACE_TTL_SECONDS))
+
+# Reports of recently evaluated posters, keyed by the hash of the uploaded bytes. 0 disables the cache
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", 64))
+
+# Color contrast section colors: "kmeans" clusters every section, "palette" quantizes the poster once
+CONTRAST_MODE = os.environ.get("CONTRAST_MODE", "kmeans")
+
+# Hyperlink checks: per-request timeout, overall deadline per poster, shared worker pool and result cache
+LINK_CHECK_TIMEOUT = float(os.environ.get("LINK_CHECK_TIMEOUT", 5))
+LINK_CHECK_DEADLINE = float(os.environ.get("LINK_CHECK_DEADLINE", 15))
+LINK_CHECK_WORKERS = int(os.environ.get("LINK_CHECK_WORKERS", 8))
+LINK_CACHE_TTL_SECONDS = int(os.environ.get("LINK_CACHE_TTL_SECONDS", 600))
+LINK_CACHE_SIZE = int(os.environ.get("LINK_CACHE_SIZE", 1024))
+
+# Gemini requests: concurrent caption calls per poster, process-wide rate limit and retries on 429s
+CAPTION_CONCURRENCY = int(os.environ.get("CAPTION_CONCURRENCY", 4))
+LLM_REQUESTS_PER_SECOND = float(os.environ.get("LLM_REQUESTS_PER_SECOND", 4))
+LLM_BURST = int(os.environ.get("LLM_BURST", 4))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 3))
+LLM_RETRY_BASE_DELAY = float(os.environ.get("LLM_RETRY_BASE_DELAY", 1.0))
+
+# Captions: "batch" asks for all figures of a poster in one request (falling back per figure), "per_component" sends one each
+CAPTION_MODE = os.environ.get("CAPTION_MODE", "batch")
+CAPTION_BATCH_SIZE = int(os.environ.get("CAPTION_BATCH_SIZE", 16))
+
+# Images sent to Gemini: longest edge in pixels, encoding ("jpeg" or "webp") and its quality
+LLM_IMAGE_MAX_EDGE = int(os.environ.get("LLM_IMAGE_MAX_EDGE", 3072))
+LLM_IMAGE_FORMAT = os.environ.get("LLM_IMAGE_FORMAT", "jpeg")
+LLM_IMAGE_QUALITY = int(os.environ.get("LLM_IMAGE_QUALITY", 85))
+
+# On-disk cache of Gemini answers keyed by model, prompt and image hashes; an empty path disables it.
+# Kept outside utils, where the get-image route serves evaluation artifacts from.
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "Cache/llm_responses.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 20000))
+
+# Threads running the analyzers of one evaluation side by side
+ANALYZER_WORKERS = int(os.environ.get("ANALYZER_WORKERS", 4))
+
+# Batch evaluations: posters per request, posters evaluated at once and posters per YOLO layout call
+BATCH_MAX_POSTERS = int(os.environ.get("BATCH_MAX_POSTERS", 200))
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", 4))
+LAYOUT_BATCH_SIZE = int(os.environ.get("LAYOUT_BATCH_SIZE", 8))
+# Size limits of a batch, checked before anything is read or unzipped: per poster and all posters together
+BATCH_MAX_POSTER_BYTES = int(os.environ.get("BATCH_MAX_POSTER_BYTES", 50 * 2 ** 20))
+BATCH_MAX_TOTAL_BYTES = int(os.environ.get("BATCH_MAX_TOTAL_BYTES", 1024 * 2 ** 20))
+
+# Warm-up: attempts of a failing step before the backend reports itself unhealthy, and the first
+# delay between attempts, which doubles every retry
+WARMUP_ATTEMPTS = int(os.environ.get("WARMUP_ATTEMPTS", 3))
+WARMUP_RETRY_SECONDS = float(os.environ.get("WARMUP_RETRY_SECONDS", 5))
+
+# Per-request profiling (?profile=1) with cProfile and tracemalloc: off unless enabled, rows per table and traceback depth
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", 25))
+PROFILE_TRACEBACK_FRAMES = int(os.environ.get("PROFILE_TRACEBACK_FRAMES", 1))
+# Where the .prof files go, outside utils so get-image never serves them
+PROFILES_DIR = os.environ.get("PROFILES_DIR", "Profiles")
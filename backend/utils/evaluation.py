@@ -0,0 +1,155 @@
+import gc
+import time
+import cv2
+from .analyzers import AnalyzerRegistry, EvaluationContext, run_analyzers
+from .poster_layout import PosterComponentExtractor
+from .ocr import OcrIndex
+from .hyperlink import evaluateLink
+from .image_resolution import evaluate_image_accessibility
+from .author_extraction import extract_authors
+from .caption_extractor import get_image_captions
+from .font_size import check_text_font_sizes
+from .llm_payload import prepare_poster
+from .metrics import evaluation_seconds, evaluations_in_flight
+from .profiling import EvaluationProfiler
+
+# The analyzers of a poster evaluation. OCR, the Gemini author request and the
+# resolution check don't need the layout, so they run alongside YOLO.
+analyzers = AnalyzerRegistry()
+
+
+@analyzers.register("poster", critical=True)
+def decode_poster(context):
+    image = cv2.imread(context.poster_path)
+    if image is None:
+        raise FileNotFoundError(f"Could not read image at {context.poster_path}")
+    return image
+
+
+@analyzers.register("ocr", requires=["poster"])
+def run_ocr(context):
+    return OcrIndex.from_image(context.results["poster"])
+
+
+@analyzers.register("layout", requires=["poster"], uses=["ocr"], critical=True)
+def extract_layout(context):
+    extractor = PosterComponentExtractor(
+        context.poster_path,
+        workspace=context.workspace,
+        image=context.results["poster"],
+        # Only needed after YOLO, so layout doesn't wait for OCR to start. Without the ocr
+        # analyzer's index (skipped or failed) the extractor runs its own OCR
+        ocr=lambda: context.wait("ocr"),
+        layout_predictor=context.options.get("layout_predictor")
+    )
+    extractor.extractComponents()
+    return extractor
+
+
+@analyzers.register("hyperlinks", requires=["ocr"])
+def check_hyperlinks(context):
+    return evaluateLink(context.poster_path, context.results["ocr"])
+
+
+@analyzers.register("llm_poster", requires=["poster"])
+def prepare_llm_poster(context):
+    # One downscaled, encoded poster for every Gemini request of this evaluation
+    return prepare_poster(context.results["poster"], context.poster_path)
+
+
+@analyzers.register("authors", requires=["llm_poster"])
+def find_authors(context):
+    return extract_authors(context.poster_path, None, context.results["llm_poster"], context.use_cache)
+
+
+@analyzers.register("image_resolution", default={})
+def check_image_resolution(context):
+    return evaluate_image_accessibility(context.poster_path)
+
+
+@analyzers.register("captions", requires=["layout", "llm_poster"], default={})
+def find_captions(context):
+    return get_image_captions(context.poster_path, context.results["layout"].raw_components,
+                              None, context.results["llm_poster"], context.use_cache)
+
+
+@analyzers.register("font_sizes", requires=["layout", "ocr"], default={})
+def check_font_sizes(context):
+    return check_text_font_sizes(context.poster_path, context.results["layout"].raw_components,
+                                 context.results["ocr"])
+
+
+# Stages reported to job progress, in the order they are scheduled
+EVALUATION_STAGES = analyzers.names()
+
+
+def analyzer_sections(context, name):
+    """Report sections built from the result of analyzer name, computed once per evaluation"""
+    if name not in context.sections:
+        value = context.results.get(name)
+        if name == "layout":
+            # poster_layout, logo_evaluation and color_contrast
+            sections = value.get_report() if value is not None else {}
+        elif name in ("hyperlinks", "authors"):
+            sections = {name: value} if value else {}
+        elif name in ("image_resolution", "captions", "font_sizes"):
+            sections = {name: value}
+        else:
+            sections = {}
+        context.sections[name] = sections
+    return context.sections[name]
+
+
+def build_report(context):
+    """The evaluation report in the shape the frontend reads, plus per-stage timings"""
+    report = {}
+    for name in analyzers.names():
+        if name in context.results:
+            report.update(analyzer_sections(context, name))
+    report["job_id"] = context.workspace.job_id
+    report["stages"] = context.stages
+    return report
+
+
+def run_evaluation(file_path, workspace, use_cache=True, progress=None, names=None, skip=(), on_sections=None,
+                   profile=False, **options):
+    """Run the analyzers on the saved poster and return the complete report.
+
+    use_cache=False asks Gemini again instead of reusing cached answers.
+    progress(stage, status) is called as each analyzer starts and ends. names
+    limits the run to those analyzers and their dependencies; skip leaves
+    analyzers out together with everything depending on them.
+    on_sections(stage, status, sections) receives the report sections of each
+    analyzer as soon as it finishes, for streaming them to the client.
+    options are available to the analyzers, e.g. a shared layout_predictor.
+    profile=True runs the analyzers one at a time under cProfile and tracemalloc
+    and adds the results to the report under "profile".
+    """
+    context = EvaluationContext(file_path, workspace, use_cache, **options)
+
+    def listener(stage, status):
+        if progress:
+            progress(stage, status)
+        if on_sections and status in ("done", "failed", "skipped"):
+            on_sections(stage, status, analyzer_sections(context, stage))
+
+    profiler = EvaluationProfiler() if profile else None
+    evaluations_in_flight.inc()
+    start, status = time.perf_counter(), "failed"
+    try:
+        if profiler:
+            # One analyzer at a time, so memory peaks can be attributed to a stage
+            with profiler:
+                run_analyzers(analyzers.select(names, skip), context, max_workers=1, listener=listener,
+                              profiler=profiler)
+        else:
+            run_analyzers(analyzers.select(names, skip), context, listener=listener)
+        status = "done"
+    finally:
+        evaluations_in_flight.dec()
+        evaluation_seconds.observe(time.perf_counter() - start, status)
+    report = build_report(context)
+    if profiler:
+        report["profile"] = profiler.report(context.workspace.job_id)
+    gc.collect()  # Force garbage collection after processing
+    return report
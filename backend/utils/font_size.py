@@ -1,7 +1,8 @@
 import cv2
 import pytesseract
-import os
 import platform
+from .components import components_of_type
+from .metrics import tesseract_seconds
 
 # Platform-specific Tesseract path
 def get_tesseract_path():
@@ -15,14 +16,15 @@ tesseract_path = get_tesseract_path()
 if tesseract_path:
     pytesseract.pytesseract.tesseract_cmd = tesseract_path
 
-def calculate_font_size(image_path: str) -> dict:
+def calculate_font_size(image) -> dict:
     try:
-        img = cv2.imread(image_path)
-        if img is None:
+        img = cv2.imread(image) if isinstance(image, str) else image
+        if img is None or img.size == 0:
             return None
             
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+        with tesseract_seconds.time("font_size_crop"):
+            data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
         
         font_sizes = []
         for i in range(len(data['text'])):
@@ -31,49 +33,49 @@ def calculate_font_size(image_path: str) -> dict:
                 if text_height > 0:
                     font_sizes.append(text_height)
         
-        if not font_sizes:
-            return None
-            
-        avg_font_size = sum(font_sizes) / len(font_sizes)
-        
-        return {
-            "font_size": round(avg_font_size, 2),
-            "min_size": min(font_sizes),
-            "max_size": max(font_sizes),
-            "text_count": len(font_sizes)
-        }
+        return summarize_font_sizes(font_sizes)
         
     except Exception as e:
         print(f"Error calculating font size: {str(e)}")
         return None
 
-def check_text_font_sizes(poster_path: str) -> dict:
-    raw_components_dir = "utils/Memory/Raw Components"
-    if not os.path.exists(raw_components_dir):
-        return {}
+def font_size_from_words(words) -> dict:
+    """Font size of a region from the words an OcrIndex found inside it"""
+    font_sizes = [word.height for word in words if word.conf > 60 and word.height > 0]
+    return summarize_font_sizes(font_sizes)
+
+def summarize_font_sizes(font_sizes) -> dict:
+    if not font_sizes:
+        return None
         
-    font_sizes = {}
+    avg_font_size = sum(font_sizes) / len(font_sizes)
     
-    patterns = {
-        'plain_text': 'plain_text_',
-        'heading': 'heading_',
-        'authors': 'authors_',
-        'caption': 'caption_'
+    return {
+        "font_size": round(avg_font_size, 2),
+        "min_size": min(font_sizes),
+        "max_size": max(font_sizes),
+        "text_count": len(font_sizes)
     }
-    
-    for component_type, prefix in patterns.items():
-        files = [f for f in os.listdir(raw_components_dir) 
-                if f.startswith(prefix) and f.endswith('.jpg')]
-        
-        for file in files:
-            file_path = os.path.join(raw_components_dir, file)
-            font_info = calculate_font_size(file_path)
-            if font_info is not None:  # Only add to results if valid measurements exist
-                component_name = file.replace('.jpg', '')
-                font_sizes[component_name] = {
-                    **font_info,
-                    "img": f"get-image/Memory/Raw Components/{file}",
-                    "type": component_type
-                }
-    return font_sizes
 
+def check_text_font_sizes(poster_path: str, components: list, ocr=None) -> dict:
+    """Measure the text height of every text component from the layout extractor.
+
+    With the poster's OcrIndex the words are looked up by bounding box; otherwise
+    each crop is OCR'd on its own.
+    """
+    font_sizes = {}
+
+    component_types = ['plain_text', 'heading', 'authors', 'caption']
+
+    for component in components_of_type(components, component_types):
+        if ocr is not None:
+            font_info = font_size_from_words(ocr.words_in(component.bbox))
+        else:
+            font_info = calculate_font_size(component.image)
+        if font_info is not None:  # Only add to results if valid measurements exist
+            font_sizes[component.name] = {
+                **font_info,
+                "img": component.save(),
+                "type": component.type
+            }
+    return font_sizes
@@ -2,8 +2,16 @@ import pytesseract
 import cv2
 import re
 import requests
+from requests.adapters import HTTPAdapter
 import platform
 import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from .ocr import OcrIndex
+from .metrics import link_check_seconds
+from .config import LINK_CHECK_TIMEOUT, LINK_CHECK_DEADLINE, LINK_CHECK_WORKERS, LINK_CACHE_TTL_SECONDS, LINK_CACHE_SIZE
 
 # Platform-specific Tesseract path
 def get_tesseract_path():
@@ -12,16 +20,110 @@ def get_tesseract_path():
     # On Mac/Linux, it's typically in the PATH
     return None
 
-def check_link(url):
+class LinkCache:
+    """Link check results shared across requests, each kept for ttl seconds"""
+
+    def __init__(self, ttl=LINK_CACHE_TTL_SECONDS, max_entries=LINK_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and entry[1] < time.monotonic():
+                del self._entries[url]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def put(self, url, is_working):
+        with self._lock:
+            self._entries[url] = (is_working, time.monotonic() + self.ttl)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+link_cache = LinkCache()
+
+# One session keeps a connection pool per host; the pool is sized for the worker count
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=LINK_CHECK_WORKERS, pool_maxsize=LINK_CHECK_WORKERS)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
+# Bounded pool shared by every request so concurrent posters can't open unlimited connections
+_executor = ThreadPoolExecutor(max_workers=LINK_CHECK_WORKERS, thread_name_prefix="link-check")
+
+def normalize_url(url):
     if not url.startswith(('http://', 'https://')):
         url = 'http://' + url
+    return url
+
+def check_link(url, session=None, timeout=LINK_CHECK_TIMEOUT):
+    url = normalize_url(url)
+    start = time.perf_counter()
     try:
-        response = requests.head(url, allow_redirects=True, timeout=5)
-        return response.status_code >= 200 and response.status_code < 400
+        response = (session or _session).head(url, allow_redirects=True, timeout=timeout)
+        is_working = response.status_code >= 200 and response.status_code < 400
     except requests.exceptions.RequestException:
-        return False
+        is_working = False
+    link_check_seconds.observe(time.perf_counter() - start, "valid" if is_working else "invalid")
+    return is_working
 
-def evaluateLink(poster):
+def check_links(urls, deadline=LINK_CHECK_DEADLINE, cache=link_cache):
+    """Check a list of URLs concurrently and return {url: is_working}.
+
+    Duplicates are checked once and cached results are reused. URLs still pending
+    when the deadline passes count as not working and are not cached.
+    """
+    results = {}
+    pending = {}
+    for url in dict.fromkeys(urls):
+        cached = cache.get(normalize_url(url)) if cache is not None else None
+        if cached is not None:
+            results[url] = cached
+        else:
+            pending[_executor.submit(check_link, url)] = url
+
+    done, not_done = wait(pending, timeout=deadline)
+    for future in done:
+        url = pending[future]
+        results[url] = future.result()
+        if cache is not None:
+            cache.put(normalize_url(url), results[url])
+    for future in not_done:
+        future.cancel()
+        results[pending[future]] = False
+
+    return results
+
+def evaluateLink(poster, ocr=None):
+    """Find URLs in the poster text and check whether they resolve.
+
+    ocr is the poster's OcrIndex; without it Tesseract is run on the poster here.
+    """
     # Set tesseract path if needed
     tesseract_path = get_tesseract_path()
     if tesseract_path:
@@ -31,28 +133,22 @@ def evaluateLink(poster):
         if not os.path.exists(poster):
             return {}
             
-        image = cv2.imread(poster)
-        if image is None:
-            return {}
-            
-        data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        if ocr is None:
+            image = cv2.imread(poster)
+            if image is None:
+                return {}
+            ocr = OcrIndex.from_image(image)
 
         url_pattern = r'\b(?:[a-zA-Z0-9-]+\.)+(com|edu|org|net|gov|mil|info|biz|co|io|ai|tech|me|us|uk|ca|in|pdf)\b'
         link_statuses = {}
 
-        for i in range(len(data['text'])):
-            word = data['text'][i]
-            if re.search(url_pattern, word):
-                is_working = check_link(word)
-                link_statuses[word] = "Valid" if is_working else "Invalid"
-                (x, y, w, h) = (data['left'][i], data['top'][i], data['width'][i], data['height'][i])
-                color = (0, 255, 17) if is_working else (0, 0, 255)
-                cv2.rectangle(image, (x, y), (x + w, y + h), color, 2)
-                cv2.putText(image, "Valid" if is_working else "Invalid", 
-                        (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        link_words = [ocr_word for ocr_word in ocr.words if re.search(url_pattern, ocr_word.text)]
+        working = check_links([ocr_word.text for ocr_word in link_words])
+
+        for ocr_word in link_words:
+            link_statuses[ocr_word.text] = "Valid" if working[ocr_word.text] else "Invalid"
 
         return link_statuses
     except Exception as e:
         print(f"Error evaluating links: {str(e)}")
         return {}
-
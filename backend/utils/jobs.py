@@ -0,0 +1,99 @@
+import time
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from .config import JOB_WORKERS, JOB_MAX_PENDING, JOB_RESULT_TTL_SECONDS
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, stages):
+        self.job_id = job_id
+        self.status = "queued"
+        self.stages = {stage: "pending" for stage in stages}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def set_stage(self, stage, status):
+        self.stages[stage] = status
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def to_dict(self):
+        job = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stages": dict(self.stages),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if self.status == "done":
+            job["result"] = self.result
+        if self.status == "failed":
+            job["error"] = self.error
+        return job
+
+
+class JobManager:
+    """Runs evaluations on a bounded thread pool and keeps their results for a while"""
+
+    def __init__(self, max_workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING, ttl=JOB_RESULT_TTL_SECONDS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_id, stages, fn, *args):
+        """Queue fn(*args, progress=job.set_stage) and return the Job tracking it"""
+        self.purge_expired()
+        job = Job(job_id, stages)
+        with self._lock:
+            pending = sum(1 for existing in self.jobs.values() if not existing.finished)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"Too many pending jobs ({pending}), try again later")
+            self.jobs[job_id] = job
+        self.executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job, fn, args):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, progress=job.set_stage)
+            job.status = "done"
+        except Exception as e:
+            traceback.print_exc()
+            for stage, status in job.stages.items():
+                if status == "running":
+                    job.stages[stage] = "failed"
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        self.purge_expired()
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def active_job_ids(self):
+        with self._lock:
+            return {job_id for job_id, job in self.jobs.items() if not job.finished}
+
+    def purge_expired(self):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job.finished and job.finished_at < cutoff]
+            for job_id in expired:
+                del self.jobs[job_id]
@@ -0,0 +1,118 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from .config import LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES
+
+
+class CachedResponse:
+    """Stands in for a generate_content response served from the cache"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+def request_key(client, parts):
+    """(model name, prompt hash, image hash) of a generate_content request"""
+    prompt = hashlib.sha256()
+    images = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            prompt.update(part.encode("utf-8") + b"\0")
+        elif isinstance(part, dict) and "data" in part:
+            images.update(part.get("mime_type", "").encode("utf-8") + b"\0" + part["data"])
+        else:
+            # PIL images
+            images.update(f"{part.mode}{part.size}".encode("utf-8") + part.tobytes())
+    model = getattr(client, "model_name", type(client).__name__)
+    return model, prompt.hexdigest(), images.hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite store of LLM answers with a TTL and a least-recently-used size bound.
+
+    The file is shared by every worker process of the server.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL_SECONDS, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False,
+                                               isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " model TEXT, prompt_hash TEXT, image_hash TEXT, response TEXT,"
+                " created_at REAL, used_at REAL,"
+                " PRIMARY KEY (model, prompt_hash, image_hash))"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)")
+        return self._connection
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT response FROM responses WHERE model = ? AND prompt_hash = ? AND image_hash = ?"
+                " AND created_at > ?", (*key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute(
+                "UPDATE responses SET used_at = ? WHERE model = ? AND prompt_hash = ? AND image_hash = ?",
+                (now, *key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, response):
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)", (*key, response, now, now)
+            )
+            expired = connection.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,)).rowcount
+            excess = connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                connection.execute(
+                    "DELETE FROM responses WHERE rowid IN"
+                    " (SELECT rowid FROM responses ORDER BY used_at LIMIT ?)", (excess,)
+                )
+            self.evictions += max(0, expired) + max(0, excess)
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0],
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+# Process-wide cache used by llm_client.generate_content, None when disabled
+llm_cache = LLMResponseCache() if LLM_CACHE_PATH else None
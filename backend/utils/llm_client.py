@@ -0,0 +1,121 @@
+import os
+import time
+import random
+import threading
+import json
+from .config import LLM_REQUESTS_PER_SECOND, LLM_BURST, LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY
+from .metrics import llm_metrics, payload_size, llm_request_seconds
+from . import llm_cache as response_cache
+
+
+class TokenBucket:
+    """Blocking token bucket: at most `burst` requests at once, refilled at `rate` per second"""
+
+    def __init__(self, rate=LLM_REQUESTS_PER_SECOND, burst=LLM_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Gemini quotas are per API key, so every analyzer in the process shares one bucket
+rate_limiter = TokenBucket()
+
+
+def _default_client_factory(model_name):
+    import google.generativeai as genai
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        return None
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+_client_factory = _default_client_factory
+
+
+def set_client_factory(factory):
+    """Replace how LLM clients are built, e.g. with a local fake for offline runs.
+
+    factory(model_name) must return an object with generate_content(parts) whose
+    result has a .text attribute, or None when no client is available.
+    """
+    global _client_factory
+    _client_factory = factory or _default_client_factory
+
+
+def get_client(model_name):
+    return _client_factory(model_name)
+
+
+def is_rate_limit_error(error):
+    """True for Gemini 429 / resource exhausted errors"""
+    return (type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+            or "429" in str(error) or "rate limit" in str(error).lower())
+
+
+def generate_content(client, parts, operation="llm", use_cache=True, max_retries=LLM_MAX_RETRIES,
+                     base_delay=LLM_RETRY_BASE_DELAY, limiter=None):
+    """client.generate_content(parts) behind the rate limiter, retrying rate-limit errors with backoff.
+
+    Answers are served from and stored in the on-disk response cache unless
+    use_cache is False. Every attempt is recorded in llm_metrics under operation.
+    """
+    cache = response_cache.llm_cache if use_cache else None
+    if cache is not None:
+        key = response_cache.request_key(client, parts)
+        cached = cache.get(key)
+        if cached is not None:
+            return response_cache.CachedResponse(cached)
+
+    limiter = limiter or rate_limiter
+    payload_bytes, estimated_tokens = payload_size(parts)
+    for attempt in range(max_retries + 1):
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = client.generate_content(parts)
+        except Exception as e:
+            seconds = time.perf_counter() - start
+            llm_metrics.record(operation, payload_bytes, estimated_tokens, seconds, error=True)
+            llm_request_seconds.observe(seconds, operation, "error")
+            if attempt == max_retries or not is_rate_limit_error(e):
+                raise
+            # Exponential backoff with jitter so parallel callers don't retry in lockstep
+            time.sleep(base_delay * (2 ** attempt) * (1 + random.random() / 2))
+            continue
+
+        seconds = time.perf_counter() - start
+        llm_metrics.record(operation, payload_bytes, estimated_tokens, seconds)
+        llm_request_seconds.observe(seconds, operation, "ok")
+        if cache is not None:
+            cache.put(key, response.text)
+        return response
+
+
+def parse_json_response(text):
+    """Decode a JSON answer, allowing the ```json fences Gemini likes to add. None if it isn't JSON"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    try:
+        return json.loads(text.strip())
+    except json.JSONDecodeError:
+        return None
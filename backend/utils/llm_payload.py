@@ -0,0 +1,85 @@
+import os
+import time
+import cv2
+from .config import LLM_IMAGE_MAX_EDGE, LLM_IMAGE_FORMAT, LLM_IMAGE_QUALITY
+from .metrics import llm_metrics
+
+ENCODINGS = {
+    "jpeg": (".jpg", "image/jpeg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", "image/webp", cv2.IMWRITE_WEBP_QUALITY)
+}
+# Upload formats Gemini takes as they are, when re-encoding wouldn't make them smaller
+UPLOAD_MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+
+
+class ImagePayload:
+    """An image encoded once for Gemini requests.
+
+    part is passed to generate_content as is. scale maps original pixel
+    coordinates to payload coordinates.
+    """
+
+    def __init__(self, data, mime_type, width, height, scale, original_bytes):
+        self.part = {"mime_type": mime_type, "data": data}
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.original_bytes = original_bytes
+
+    @property
+    def nbytes(self):
+        return len(self.part["data"])
+
+
+def _encode(image, max_edge, image_format, quality, original_bytes):
+    height, width = image.shape[:2]
+    scale = min(1.0, max_edge / max(height, width))
+    if scale < 1.0:
+        image = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+
+    extension, mime_type, quality_flag = ENCODINGS[image_format.lower()]
+    ok, encoded = cv2.imencode(extension, image, [quality_flag, quality])
+    if not ok:
+        raise ValueError(f"Could not encode image as {image_format}")
+
+    if original_bytes is None:
+        original_bytes = width * height * (image.shape[2] if image.ndim == 3 else 1)
+    return ImagePayload(encoded.tobytes(), mime_type, image.shape[1], image.shape[0], scale, original_bytes)
+
+
+def prepare_image(image, max_edge=LLM_IMAGE_MAX_EDGE, image_format=LLM_IMAGE_FORMAT,
+                  quality=LLM_IMAGE_QUALITY, original_bytes=None, kind="crop"):
+    """Downscale a BGR image to max_edge and encode it once.
+
+    original_bytes is what the image would have cost unprepared (the uncompressed
+    size by default); the difference is recorded in llm_metrics under kind.
+    """
+    start = time.perf_counter()
+    payload = _encode(image, max_edge, image_format, quality, original_bytes)
+    llm_metrics.record_payload(kind, payload.original_bytes, payload.nbytes, time.perf_counter() - start)
+    return payload
+
+
+def prepare_poster(poster, poster_path=None):
+    """Payload of the whole poster, shared by every Gemini analyzer of one request.
+
+    poster is the decoded BGR poster, or a path to read it from. Savings are
+    measured against the file as uploaded, which is sent unchanged instead if
+    re-encoding would make it larger (e.g. small or flat-colour PNGs).
+    """
+    start = time.perf_counter()
+    if isinstance(poster, str):
+        poster_path, poster = poster, cv2.imread(poster)
+        if poster is None:
+            raise ValueError(f"Could not read poster: {poster_path}")
+    original_bytes = os.path.getsize(poster_path) if poster_path and os.path.exists(poster_path) else None
+    payload = _encode(poster, LLM_IMAGE_MAX_EDGE, LLM_IMAGE_FORMAT, LLM_IMAGE_QUALITY, original_bytes)
+    mime_type = UPLOAD_MIME_TYPES.get(os.path.splitext(poster_path or "")[1].lower())
+    if original_bytes is not None and original_bytes <= payload.nbytes and mime_type:
+        with open(poster_path, "rb") as f:
+            data = f.read()
+        height, width = poster.shape[:2]
+        payload = ImagePayload(data, mime_type, width, height, 1.0, original_bytes)
+    llm_metrics.record_payload("poster", payload.original_bytes, payload.nbytes, time.perf_counter() - start)
+    return payload
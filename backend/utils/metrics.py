@@ -0,0 +1,268 @@
+import time
+import threading
+from bisect import bisect_left
+
+# Gemini bills every image as a fixed number of tokens, text at roughly 4 characters per token
+IMAGE_TOKENS = 258
+CHARS_PER_TOKEN = 4
+
+
+def _part_size(part):
+    """(bytes, estimated tokens) of one generate_content part"""
+    if isinstance(part, str):
+        return len(part.encode("utf-8")), -(-len(part) // CHARS_PER_TOKEN)
+    if isinstance(part, dict) and "data" in part:
+        return len(part["data"]), IMAGE_TOKENS
+    if hasattr(part, "size") and hasattr(part, "mode"):
+        # PIL images are encoded by the client library, count them uncompressed
+        width, height = part.size
+        return width * height * len(part.getbands()), IMAGE_TOKENS
+    return 0, 0
+
+
+def payload_size(parts):
+    """Total (bytes, estimated tokens) of a generate_content request"""
+    sizes = [_part_size(part) for part in parts]
+    return sum(size[0] for size in sizes), sum(size[1] for size in sizes)
+
+
+class LLMMetrics:
+    """Per-operation counters of the LLM requests made by this process"""
+
+    def __init__(self):
+        self._operations = {}
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation, payload_bytes, estimated_tokens, seconds, error=False):
+        with self._lock:
+            entry = self._operations.setdefault(operation, {
+                "calls": 0, "errors": 0, "payload_bytes": 0, "estimated_tokens": 0, "seconds": 0.0
+            })
+            entry["calls"] += 1
+            entry["errors"] += int(error)
+            entry["payload_bytes"] += payload_bytes
+            entry["estimated_tokens"] += estimated_tokens
+            entry["seconds"] += seconds
+
+    def record_payload(self, kind, original_bytes, prepared_bytes, seconds):
+        """An image downscaled and encoded for LLM requests"""
+        # An image can't be sent cheaper than it was, e.g. a tiny crop whose encoded headers outweigh
+        # its pixels, so it counts as no saving rather than a negative one
+        original_bytes = max(original_bytes, prepared_bytes)
+        with self._lock:
+            entry = self._payloads.setdefault(kind, {
+                "images": 0, "original_bytes": 0, "prepared_bytes": 0, "seconds": 0.0
+            })
+            entry["images"] += 1
+            entry["original_bytes"] += original_bytes
+            entry["prepared_bytes"] += prepared_bytes
+            entry["seconds"] += seconds
+
+    def payload_stats(self):
+        with self._lock:
+            return {
+                kind: {
+                    **entry,
+                    "seconds": round(entry["seconds"], 3),
+                    "saved_bytes": entry["original_bytes"] - entry["prepared_bytes"],
+                    "saved_ratio": round(1 - entry["prepared_bytes"] / entry["original_bytes"], 3)
+                    if entry["original_bytes"] else 0.0
+                }
+                for kind, entry in self._payloads.items()
+            }
+
+    def stats(self):
+        with self._lock:
+            return {
+                operation: {
+                    **entry,
+                    "seconds": round(entry["seconds"], 3),
+                    "avg_seconds": round(entry["seconds"] / entry["calls"], 3) if entry["calls"] else 0.0,
+                    "avg_payload_bytes": entry["payload_bytes"] // entry["calls"] if entry["calls"] else 0
+                }
+                for operation, entry in self._operations.items()
+            }
+
+
+# Process-wide counters, served by the /llm endpoint
+llm_metrics = LLMMetrics()
+
+
+# Latency buckets in seconds, from a cached link check up to a slow Gemini request or a full evaluation
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """A metric family; label values are passed positionally, in the order of labels"""
+
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in values]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        # Only the matching bucket is incremented; buckets are made cumulative when rendered
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def time(self, *labels):
+        """Context manager observing the duration of its block"""
+        return _Timer(self, labels)
+
+    def render(self):
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = self.header()
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labels, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class _Collected(_Metric):
+    """Values read from existing counters when /metrics is scraped, so the hot path pays nothing"""
+
+    def __init__(self, name, documentation, labels, metric_type, collect):
+        super().__init__(name, documentation, labels)
+        self.type = metric_type
+        self.collect = collect
+
+    def render(self):
+        return self.header() + [f"{self.name}{_format_labels(self.labels, key)} {value}"
+                                for key, value in self.collect().items() if value is not None]
+
+
+class MetricsRegistry:
+    """Metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._add(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=()):
+        return self._add(Gauge(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, documentation, labels, buckets))
+
+    def collect(self, name, documentation, labels, metric_type, collect):
+        """A metric whose values collect() returns as {label values tuple: value} at scrape time"""
+        return self._add(_Collected(name, documentation, labels, metric_type, collect))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # One broken collector shouldn't take the whole endpoint down
+                lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide metrics, served by the /metrics endpoint
+registry = MetricsRegistry()
+analyzer_seconds = registry.histogram(
+    "poster_analyzer_seconds", "Duration of each evaluation analyzer", ["analyzer", "status"])
+evaluation_seconds = registry.histogram(
+    "poster_evaluation_seconds", "Duration of complete poster evaluations", ["status"])
+evaluations_in_flight = registry.gauge(
+    "poster_evaluations_in_flight", "Poster evaluations currently running")
+model_call_seconds = registry.histogram(
+    "poster_model_call_seconds", "Inference time of the shared YOLO and spaCy models", ["model", "method"])
+tesseract_seconds = registry.histogram(
+    "poster_tesseract_seconds", "Tesseract invocations and their duration", ["caller"])
+link_check_seconds = registry.histogram(
+    "poster_link_check_seconds", "Duration of each link check", ["result"])
+llm_request_seconds = registry.histogram(
+    "poster_llm_request_seconds", "Duration of each Gemini request attempt", ["operation", "status"])
+http_request_seconds = registry.histogram(
+    "poster_http_request_seconds", "Duration of HTTP requests", ["endpoint", "method", "status"])
+http_requests_in_flight = registry.gauge(
+    "poster_http_requests_in_flight", "HTTP requests currently being handled")
+registry.collect("poster_llm_payload_bytes_total", "Bytes sent to Gemini, including retries", ["operation"],
+                 "counter", lambda: {(operation, ): entry["payload_bytes"]
+                                     for operation, entry in llm_metrics.stats().items()})
+registry.collect("poster_llm_estimated_tokens_total", "Estimated input tokens sent to Gemini", ["operation"],
+                 "counter", lambda: {(operation, ): entry["estimated_tokens"]
+                                     for operation, entry in llm_metrics.stats().items()})
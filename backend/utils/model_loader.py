@@ -1,6 +1,5 @@
 import os
 import logging
-from google.cloud import storage
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,6 +21,7 @@ def get_model_paths():
     
     # Initialize GCS client
     try:
+        from google.cloud import storage
         client = storage.Client()
         bucket = client.bucket(bucket_name)
     except Exception as e:
@@ -0,0 +1,166 @@
+import os
+import time
+import threading
+import logging
+from utils.model_loader import get_model_paths
+from utils.metrics import model_call_seconds
+
+logger = logging.getLogger(__name__)
+
+
+def _load_yolov10(path):
+    from doclayout_yolo import YOLOv10
+    return YOLOv10(path)
+
+
+def _load_yolo(path):
+    from ultralytics import YOLO
+    return YOLO(path)
+
+
+def _load_spacy_ner(name):
+    """spaCy pipeline with everything but the entity recognizer (and its tok2vec, if shared) disabled"""
+    import spacy
+    nlp = spacy.load(name)
+    keep = ["ner"]
+    if "tok2vec" in nlp.pipe_names and "ner" in getattr(nlp.get_pipe("tok2vec"), "listening_components", []):
+        keep.append("tok2vec")
+    nlp.select_pipes(enable=keep)
+    return nlp
+
+
+# Model name -> loader. The .pt names match the keys returned by get_model_paths(),
+# other models are loaded by name
+MODEL_LOADERS = {
+    "base.pt": _load_yolov10,
+    "figure_classifier.pt": _load_yolo,
+    "logo_classifier.pt": _load_yolo,
+    "en_core_web_sm": _load_spacy_ner
+}
+
+
+def _current_rss_bytes():
+    """Resident set size of this process, or None if it can't be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def _parameter_bytes(model):
+    """Size of the model weights in bytes, or None for non-torch models"""
+    try:
+        module = getattr(model, "model", model)
+        return sum(p.numel() * p.element_size() for p in module.parameters())
+    except Exception:
+        return None
+
+
+class SharedModel:
+    """Proxy around a loaded model that is shared by every extractor.
+
+    Ultralytics predictors and spaCy pipelines keep per-call state, so inference
+    calls are serialized with a lock. Everything else is forwarded to the model.
+    """
+
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock, model_call_seconds.time(self.name, "call"):
+            return self.model(*args, **kwargs)
+
+    def predict(self, *args, **kwargs):
+        with self._lock, model_call_seconds.time(self.name, "predict"):
+            return self.model.predict(*args, **kwargs)
+
+    def pipe(self, *args, **kwargs):
+        with self._lock, model_call_seconds.time(self.name, "pipe"):
+            return list(self.model.pipe(*args, **kwargs))
+
+    def __getattr__(self, item):
+        return getattr(self.model, item)
+
+
+class ModelRegistry:
+    """Loads each model once per process and hands out the shared instance"""
+
+    def __init__(self, loaders=None):
+        self.loaders = dict(loaders or MODEL_LOADERS)
+        self._models = {}
+        self._stats = {}
+        self._model_paths = None
+        self._lock = threading.Lock()
+        self._model_locks = {name: threading.Lock() for name in self.loaders}
+
+    def _get_paths(self):
+        """Model paths, looked up again while any is missing so a late download or sync is picked up"""
+        with self._lock:
+            if self._model_paths is not None:
+                return self._model_paths
+            paths = get_model_paths()
+            if all(path is not None for path in paths.values()):
+                self._model_paths = paths
+            return paths
+
+    def get(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self.loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._model_locks[name]:
+            # Another thread may have loaded it while we waited
+            if name in self._models:
+                return self._models[name]
+
+            if name.endswith(".pt"):
+                path = self._get_paths().get(name)
+                if path is None:
+                    raise RuntimeError(f"The following required models are missing: {name}")
+            else:
+                path = name
+
+            rss_before = _current_rss_bytes()
+            start = time.perf_counter()
+            loaded = self.loaders[name](path)
+            load_seconds = time.perf_counter() - start
+            rss_after = _current_rss_bytes()
+
+            self._stats[name] = {
+                "path": path,
+                "load_seconds": round(load_seconds, 3),
+                "parameter_bytes": _parameter_bytes(loaded),
+                "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None
+            }
+            logger.info(f"Loaded model {name} in {load_seconds:.2f}s")
+
+            self._models[name] = SharedModel(name, loaded)
+            return self._models[name]
+
+    def load_all(self):
+        """Load every registered model, raising if any of them is missing"""
+        missing = [name for name, path in self._get_paths().items() if path is None]
+        if missing:
+            raise RuntimeError(f"The following required models are missing: {', '.join(missing)}")
+        for name in self.loaders:
+            self.get(name)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def stats(self):
+        return {
+            name: {"loaded": name in self._models, **self._stats.get(name, {})}
+            for name in self.loaders
+        }
+
+
+# Process-wide registry used by the extractor and the Flask endpoints
+model_registry = ModelRegistry()
@@ -0,0 +1,83 @@
+import cv2
+import pytesseract
+import platform
+from .spatial_index import GridIndex
+from .metrics import tesseract_seconds
+
+# Platform-specific Tesseract path
+if platform.system() == 'Windows':
+    pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+
+class OcrWord:
+    def __init__(self, text, conf, left, top, width, height, block, paragraph, line):
+        self.text = text
+        self.conf = conf
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.block = block
+        self.paragraph = paragraph
+        self.line = line
+
+    @property
+    def bbox(self):
+        return (self.left, self.top, self.left + self.width, self.top + self.height)
+
+    @property
+    def center(self):
+        return (self.left + self.width / 2, self.top + self.height / 2)
+
+
+class OcrIndex:
+    """Word boxes of one Tesseract pass over the whole poster.
+
+    Region queries answer the link, author and font size checks without running
+    Tesseract again on every crop.
+    """
+
+    def __init__(self, data, cell_size=128):
+        self.words = []
+        self.grid = GridIndex(cell_size)
+        for i in range(len(data['text'])):
+            text = data['text'][i].strip()
+            if not text:
+                continue
+            self.words.append(OcrWord(
+                text=text,
+                conf=float(data['conf'][i]),
+                left=int(data['left'][i]),
+                top=int(data['top'][i]),
+                width=int(data['width'][i]),
+                height=int(data['height'][i]),
+                block=int(data['block_num'][i]),
+                paragraph=int(data['par_num'][i]),
+                line=int(data['line_num'][i])
+            ))
+            self.grid.insert(self.words[-1].bbox, self.words[-1])
+
+    @classmethod
+    def from_image(cls, image):
+        """Run Tesseract once over a BGR (or grayscale) poster"""
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        with tesseract_seconds.time("poster"):
+            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        return cls(data)
+
+    def words_in(self, bbox):
+        """Words whose center lies inside bbox, in reading order"""
+        return self.grid.centered_in(bbox)
+
+    def text_in(self, bbox):
+        """Text inside bbox with one line per Tesseract line"""
+        lines = []
+        current_line = None
+        for word in self.words_in(bbox):
+            line_key = (word.block, word.paragraph, word.line)
+            if line_key != current_line:
+                lines.append([])
+                current_line = line_key
+            lines[-1].append(word.text)
+        return "\n".join(" ".join(line) for line in lines)
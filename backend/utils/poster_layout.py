@@ -1,24 +1,49 @@
 import cv2
-import spacy
-import torch
-from doclayout_yolo import YOLOv10
 import warnings
 import pytesseract
-from PIL import Image
-from ultralytics import YOLO
 import numpy as np
-import math
 import os
 from .color_contrast_evaluation import ColorContrastEvaluator
-import google.generativeai as genai
-from utils.model_loader import get_model_paths
+from .components import Component
+from .workspace import Workspace, image_url
+from .ocr import OcrIndex
+from .spatial_index import GridIndex
+from .batching import BatchPredictor
+from utils.model_registry import model_registry
 import platform
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-api_key = os.environ.get("GEMINI_API_KEY")
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel("gemini-1.5-flash-latest")
+# Figures classified as "Logo" at least this large (in pixels) are treated as diagrams
+LOGO_MAX_AREA = 34000
+# Maximum number of crops sent to a classifier in one call
+CLASSIFY_BATCH_SIZE = 32
+
+def layout_predict_kwargs():
+    """Arguments of the YOLO layout detection call"""
+    # torch is only imported once a poster is evaluated, not when the app starts
+    import torch
+    return {
+        "imgsz": 1024,
+        "conf": 0.2,
+        "device": "cuda:0" if torch.cuda.is_available() else "cpu",
+        "verbose": False
+    }
+
+def layout_batch_predictor(registry=None, max_batch=None):
+    """BatchPredictor running layout detection for several posters per YOLO call"""
+    registry = registry or model_registry
+    kwargs = {"max_batch": max_batch} if max_batch else {}
+    return BatchPredictor(registry.get("base.pt"), **kwargs, **layout_predict_kwargs())
+
+def classify_batch(model, sources, batch_size=CLASSIFY_BATCH_SIZE):
+    """Run a YOLO classifier over a list of images and return the top-1 class names"""
+    names = []
+    for start in range(0, len(sources), batch_size):
+        chunk = sources[start:start + batch_size]
+        results = model(chunk, batch=len(chunk), verbose=False)
+        names.extend(r.names[np.argmax(r.probs.data.tolist())] for r in results)
+    return names
 
 class LogoInfo:
     def __init__(self, image_path, label):
@@ -26,8 +51,13 @@ class LogoInfo:
         self.label = label
 
 class PosterComponentExtractor:
-    def __init__(self, poster_path):
+    def __init__(self, poster_path, registry=None, workspace=None, ocr=None, image=None, layout_predictor=None):
         self.poster_path = poster_path
+        self.workspace = workspace or Workspace()
+        # Word boxes of the whole poster, built by extractComponents() if not given. A callable
+        # returning the index (or None to fall back) is only called once YOLO is done, so OCR
+        # can run alongside it
+        self.ocr = ocr
         self.authors = []
         self.author_coords = []
         self.logo_count = 0
@@ -35,22 +65,23 @@ class PosterComponentExtractor:
         self.diagram_count = 0
         self.caption_count = 0
         self.annotated_image = None
-        self.original_image = None
+        # The decoded poster, if the caller already has it
+        self.original_image = image
+        # Shared BatchPredictor when several posters are evaluated together
+        self.layout_predictor = layout_predictor
         self.title_coords = {}
         self.color_contrast_evaluator = None
         self.logo_annotated_image = None
         self.logos_info = []
         self.table_count = 0
+        # component_count -> (figure_name, logo_name) filled in by classify_figures()
+        self.figure_labels = {}
+        # component_count -> is-author decision filled in by classify_author_sections()
+        self.author_sections = {}
+        # Crops handed to the font size, caption and contrast analyzers
+        self.raw_components = []
         
-        self.directories = {
-            'raw_components': "utils/Memory/Raw Components",
-            'buffer': "utils/Buffer/components",
-            'output': "utils/Output",
-            'logos': "utils/Output/Logos"
-        }
-        
-        for directory in self.directories.values():
-            os.makedirs(directory, exist_ok=True)
+        self.directories = self.workspace.directories
             
         self.component_counters = {
             'title': 0,
@@ -66,18 +97,12 @@ class PosterComponentExtractor:
             'authors': 0
         }
 
-        # Get model paths from model_loader
-        model_paths = get_model_paths()
-
-        # Verify all required models are available
-        missing_models = [name for name, path in model_paths.items() if path is None]
-        if missing_models:
-            raise RuntimeError(f"The following required models are missing: {', '.join(missing_models)}")
-
-        # Now load the models
-        self.base_model = YOLOv10(model_paths["base.pt"])
-        self.figure_model = YOLO(model_paths["figure_classifier.pt"])
-        self.logo_model = YOLO(model_paths["logo_classifier.pt"])
+        # Models are loaded once per process and shared between extractors
+        registry = registry or model_registry
+        self.base_model = registry.get("base.pt")
+        self.figure_model = registry.get("figure_classifier.pt")
+        self.logo_model = registry.get("logo_classifier.pt")
+        self.nlp = registry.get("en_core_web_sm")
 
         self.components = ['title', 'plain text', 'abandon', 'figure', 'figure_caption', 
                         'table', 'table_caption', 'table_footnote', 'isolate_formula', 'formula_caption']
@@ -90,10 +115,10 @@ class PosterComponentExtractor:
     def save_to_raw_components(self, component_type, x1, y1, x2, y2):
         self.component_counters[component_type] += 1
         count = self.component_counters[component_type]
-        filename = f"{component_type}_{count}.jpg"
-        filepath = os.path.join(self.directories['raw_components'], filename)
-        cropped_image = self.original_image[y1:y2, x1:x2]
-        cv2.imwrite(filepath, cropped_image)
+        self.raw_components.append(Component(
+            component_type, count, (x1, y1, x2, y2),
+            self.original_image[y1:y2, x1:x2], self.directories['raw_components']
+        ))
         return count
 
     def count_words(self, input_string):
@@ -101,18 +126,17 @@ class PosterComponentExtractor:
         return len(words)
 
     def count_persons(self, text):
-        nlp = spacy.load("en_core_web_sm")
+        return self.count_persons_in_doc(self.nlp(text))
+
+    def count_persons_in_doc(self, doc):
         count = 0
-        doc = nlp(text)
         for ent in doc.ents:
             if ent.label_ == "PERSON":
                 self.authors.append(ent.text)
                 count += 1
         return count
 
-    def isAuthorSection(self, image_path):
-        img = Image.open(image_path)
-        text = pytesseract.image_to_string(img)
+    def isAuthorSection(self, text):
         word_count = self.count_words(text)
         if word_count >= 25:
             return False
@@ -120,6 +144,27 @@ class PosterComponentExtractor:
             return True
         return False
 
+    def classify_author_sections(self, boxes):
+        """Decide which plain-text blocks are author sections with one batched NER pass.
+
+        Only short blocks are sent to spaCy, exactly as isAuthorSection does per block.
+        Decisions are stored in self.author_sections and picked up by handle_plain_text.
+        """
+        candidates = []
+        for component_count, row in enumerate(boxes):
+            x1, y1, x2, y2, conf, index = map(int, row[:6])
+            if self.components[index] != 'plain text':
+                continue
+            text = self.ocr.text_in((x1, y1, x2, y2))
+            if self.count_words(text) >= 25:
+                self.author_sections[component_count] = False
+            else:
+                candidates.append((component_count, text))
+
+        docs = self.nlp.pipe([text for _, text in candidates]) if candidates else []
+        for (component_count, _), doc in zip(candidates, docs):
+            self.author_sections[component_count] = self.count_persons_in_doc(doc) >= 1
+
     def process_component(self, index, x1, y1, x2, y2, cropped_image, component_count):
         component_type = self.components[index]
         handlers = {
@@ -136,11 +181,14 @@ class PosterComponentExtractor:
         handler(x1, y1, x2, y2, cropped_image, component_count, component_type)
 
     def handle_plain_text(self, x1, y1, x2, y2, cropped_image, component_count, component_type):
-        filename = os.path.join(self.directories['buffer'], f"{component_count}_{component_type}.jpg")
-        cv2.imwrite(filename, cropped_image)
+        text = self.ocr.text_in((x1, y1, x2, y2))
+        if component_count in self.author_sections:
+            is_author_section = self.author_sections[component_count]
+        else:
+            is_author_section = self.isAuthorSection(text)
 
-        if self.isAuthorSection(filename):
-            text = pytesseract.image_to_string(cropped_image).strip()
+        if is_author_section:
+            text = text.strip()
             if text:
                 self.author_coords.append((x1, y1, x2, y2, text))
                 count = self.save_to_raw_components('authors', x1, y1, x2, y2)
@@ -164,17 +212,18 @@ class PosterComponentExtractor:
 
         title_x, title_y = (title_x1 + title_x2) // 2, (title_y1 + title_y2) // 2
 
-        closest_author = None
-        min_distance = float("inf")
-
+        # Author candidates indexed by the center of their box
+        candidates = GridIndex(cell_size=256)
         for coords in self.author_coords:
             x1, y1, x2, y2, text = coords
             x, y = (x1 + x2) // 2, (y1 + y2) // 2
-            distance = math.sqrt((x - title_x) ** 2 + (y - title_y) ** 2)
+            candidates.insert((x, y, x, y), coords)
 
-            if distance < min_distance:
-                min_distance = distance
-                closest_author = coords
+        closest_author = None
+        min_distance = float("inf")
+        nearest = candidates.nearest((title_x, title_y), k=1)
+        if nearest:
+            min_distance, closest_author = nearest[0]
 
         if closest_author and min_distance < 300:
             x1, y1, x2, y2, text = closest_author
@@ -184,9 +233,6 @@ class PosterComponentExtractor:
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
             
     def handle_title(self, x1, y1, x2, y2, cropped_image, component_count, component_type):
-        filename = os.path.join(self.directories['buffer'], f"{component_count}_{component_type}.jpg")
-        cv2.imwrite(filename, cropped_image)
-
         title_area = abs((y2 - y1) * (x2 - x1))
         self.title_coords[component_count] = (x1, y1, x2, y2, title_area)
         cv2.rectangle(self.annotated_image, (x1, y1), (x2, y2), (0, 255, 255), 2)
@@ -213,33 +259,63 @@ class PosterComponentExtractor:
                     cropped_heading = self.original_image[y1:y2, x1:x2].copy()
                     self.color_contrast_evaluator.evaluate_section('heading', x1, y1, x2, y2, cropped_heading)
 
-    def handle_figure(self, x1, y1, x2, y2, cropped_image, component_count, component_type):
-        filename = os.path.join(self.directories['buffer'], f"{component_count}_{component_type}.jpg")
-        cv2.imwrite(filename, cropped_image)
+    def classify_figures(self, boxes):
+        """Classify every figure crop of the poster in batches before the components are processed.
+
+        Logos are sent through the logo model as a second batch. Labels are stored in
+        self.figure_labels and picked up by handle_figure instead of classifying each crop.
+        """
+        figure_crops = []
+        for component_count, row in enumerate(boxes):
+            x1, y1, x2, y2, conf, index = map(int, row[:6])
+            if self.components[index] not in ('figure', 'abandon'):
+                continue
+            figure_crops.append((component_count, self.original_image[y1:y2, x1:x2], abs((y2 - y1) * (x2 - x1))))
+
+        if not figure_crops:
+            return
+
+        figure_names = classify_batch(self.figure_model, [crop for _, crop, _ in figure_crops])
 
-        figure_type = self.figure_model(filename, verbose=False)
-        figure_name = figure_type[0].names[np.argmax(figure_type[0].probs.data.tolist())]
+        logo_crops = [
+            (component_count, crop)
+            for (component_count, crop, area), figure_name in zip(figure_crops, figure_names)
+            if figure_name == "Logo" and area < LOGO_MAX_AREA
+        ]
+        logo_names = {}
+        if logo_crops:
+            names = classify_batch(self.logo_model, [crop for _, crop in logo_crops])
+            logo_names = {component_count: name for (component_count, _), name in zip(logo_crops, names)}
 
+        for (component_count, _, _), figure_name in zip(figure_crops, figure_names):
+            self.figure_labels[component_count] = (figure_name, logo_names.get(component_count))
+
+    def handle_figure(self, x1, y1, x2, y2, cropped_image, component_count, component_type):
         figure_area = abs((y2 - y1) * (x2 - x1))
 
+        if component_count in self.figure_labels:
+            figure_name, logo_name = self.figure_labels[component_count]
+        else:
+            figure_name = classify_batch(self.figure_model, [cropped_image])[0]
+            logo_name = None
+            if figure_name == "Logo" and figure_area < LOGO_MAX_AREA:
+                logo_name = classify_batch(self.logo_model, [cropped_image])[0]
+
         if figure_name == "Logo":
-            if figure_area >= 34000:
+            if figure_area >= LOGO_MAX_AREA:
                 self.diagram_count += 1
                 count = self.save_to_raw_components('diagram', x1, y1, x2, y2)
                 cv2.rectangle(self.annotated_image, (x1, y1), (x2, y2), (255, 255, 0), 2)
                 cv2.putText(self.annotated_image, "Diagram", (x1, y1 - 10),
                             cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
             else:
-                logo_type = self.logo_model(filename, verbose=False)
-                logo_name = logo_type[0].names[np.argmax(logo_type[0].probs.data.tolist())]
-
                 self.logo_count += 1
                 logo_filename = f"logo_{self.logo_count}.png"
                 logo_path = os.path.join(self.directories['logos'], logo_filename)
                 cv2.imwrite(logo_path, cropped_image)
 
                 self.logos_info.append(LogoInfo(
-                    image_path=f"Output/Logos/{logo_filename}",
+                    image_path=logo_path,
                     label=logo_name
                 ))
 
@@ -297,25 +373,40 @@ class PosterComponentExtractor:
         cv2.putText(self.annotated_image, "Unknown", (x1, y1 - 10),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (128, 128, 128), 2)
 
-    def extractComponents(self):
-        self.original_image = cv2.imread(self.poster_path)
+    def extractComponents(self, batch_classify=True):
+        """Detect the poster layout and process every component.
+
+        With batch_classify the figure and logo crops are classified in two batched
+        calls and the author-section NER runs as one spaCy batch, all up front;
+        otherwise each component is classified as it is processed.
+        """
+        if self.original_image is None:
+            self.original_image = cv2.imread(self.poster_path)
         if self.original_image is None:
             raise FileNotFoundError(f"Could not read image at {self.poster_path}")
             
         self.annotated_image = self.original_image.copy()
         self.logo_annotated_image = self.original_image.copy()
-        self.color_contrast_evaluator = ColorContrastEvaluator(self.original_image)
+        self.color_contrast_evaluator = ColorContrastEvaluator(self.original_image, self.directories['color_contrast'])
+
+        # Reuse the decoded poster instead of letting YOLO read the file again
+        if self.layout_predictor is not None:
+            result = [self.layout_predictor.predict(self.original_image)]
+        else:
+            result = self.base_model.predict(self.original_image, **layout_predict_kwargs())
 
-        device = "cuda:0" if torch.cuda.is_available() else "cpu"
-        result = self.base_model.predict(
-            self.poster_path,
-            imgsz=1024,
-            conf=0.2,
-            device=device,
-            verbose=False
-        )
+        if callable(self.ocr):
+            self.ocr = self.ocr()
+        if self.ocr is None:
+            self.ocr = OcrIndex.from_image(self.original_image)
 
         boxes = result[0].boxes.data.cpu()
+        self.figure_labels = {}
+        self.author_sections = {}
+        if batch_classify:
+            self.classify_figures(boxes)
+            self.classify_author_sections(boxes)
+
         component_count = 0
 
         for row in boxes:
@@ -337,10 +428,10 @@ class PosterComponentExtractor:
             return None
 
         return {
-            "logo_evaluation_summary": "get-image/Output/Logos/logos_annotated.png",
+            "logo_evaluation_summary": image_url(os.path.join(self.directories['logos'], "logos_annotated.png")),
             "logos": [
                 {
-                    f"logo_{i+1}": "get-image/"+logo_info.image_path,
+                    f"logo_{i+1}": image_url(logo_info.image_path),
                     "label": logo_info.label
                 }
                 for i, logo_info in enumerate(self.logos_info)
@@ -349,7 +440,7 @@ class PosterComponentExtractor:
 
     def get_report(self):
         report = {
-            'poster_layout': 'get-image/Output/extracted_components.png'
+            'poster_layout': image_url(os.path.join(self.directories['output'], 'extracted_components.png'))
         }
         
         logo_eval = self.get_logo_evaluation()
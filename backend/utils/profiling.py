@@ -0,0 +1,119 @@
+import os
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from .config import PROFILE_TOP_N, PROFILE_TRACEBACK_FRAMES, PROFILES_DIR
+
+# tracemalloc is process-global, so profiled evaluations take turns
+_tracing = threading.Lock()
+
+
+class EvaluationProfiler:
+    """cProfile and tracemalloc measurements of one evaluation, broken down by analyzer.
+
+    cProfile only sees the thread it is enabled in, so every analyzer gets its
+    own profile and they are merged for the report. Work an analyzer hands to
+    other pools (caption requests, link checks) shows up as waiting time.
+    Memory is attributed per analyzer, which is only exact when the analyzers
+    run one at a time. The memory figures are process-wide: allocations of
+    anything else running meanwhile, such as unprofiled requests, are counted
+    too. Profiled evaluations wait for each other, as they would otherwise
+    reset and stop each other's tracing.
+    """
+
+    def __init__(self, top=PROFILE_TOP_N, frames=PROFILE_TRACEBACK_FRAMES):
+        self.top = top
+        self.frames = frames
+        self.stages = {}
+        self.stats = None
+        self.snapshot = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        _tracing.acquire()
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(self.frames)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self.seconds = time.perf_counter() - self.start
+            self.snapshot = tracemalloc.take_snapshot()
+            if self._started_tracing:
+                tracemalloc.stop()
+        finally:
+            _tracing.release()
+
+    @contextmanager
+    def stage(self, name):
+        """Profile the analyzer name while its block runs"""
+        profile = cProfile.Profile()
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - start
+            memory_after, peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                self.stages[name] = {
+                    "started_at": round(start - self.start, 3),
+                    "seconds": round(seconds, 3),
+                    "peak_memory_bytes": peak - memory_before,
+                    "retained_bytes": memory_after - memory_before
+                }
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+
+    def top_functions(self):
+        if self.stats is None:
+            return []
+        rows = sorted(self.stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return [{
+            "function": f"{filename}:{line}({function})",
+            "calls": calls,
+            "own_seconds": round(own, 4),
+            "cumulative_seconds": round(cumulative, 4)
+        } for (filename, line, function), (_, calls, own, cumulative, _) in rows]
+
+    def top_allocations(self):
+        """Allocation sites still holding the most memory at the end of the evaluation"""
+        if self.snapshot is None:
+            return []
+        # Leave out the profiler's own bookkeeping
+        snapshot = self.snapshot.filter_traces([
+            tracemalloc.Filter(False, module.__file__) for module in (tracemalloc, pstats, cProfile)
+        ] + [tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")])
+        return [{
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count
+        } for stat in snapshot.statistics("lineno")[:self.top]]
+
+    def save(self, name, directory=PROFILES_DIR):
+        """Write the merged profile for snakeviz/pstats and return its download URL"""
+        if self.stats is None:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        self.stats.dump_stats(os.path.join(directory, f"{name}.prof"))
+        return f"profiles/{name}.prof"
+
+    def report(self, name=None):
+        timeline = sorted(self.stages.items(), key=lambda item: item[1]["started_at"])
+        return {
+            "seconds": round(self.seconds, 3),
+            "timeline": [{"stage": name, **stage} for name, stage in timeline],
+            "top_functions": self.top_functions(),
+            "top_allocations": self.top_allocations(),
+            "download": self.save(name) if name else None
+        }
@@ -0,0 +1,82 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from .config import RESULT_CACHE_SIZE
+
+
+def poster_digest(data):
+    """Content address of an uploaded poster"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """LRU cache of finished reports keyed by poster digest.
+
+    The workspace holding a cached report's images is kept alive for as long as
+    the entry is cached and removed when the entry is evicted.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            report, _ = entry
+        return copy.deepcopy(report)
+
+    def put(self, digest, report, workspace, replace=False):
+        """Cache the report of digest.
+
+        replace=True overwrites an existing entry, for forced re-evaluations;
+        otherwise the entry already cached wins.
+        """
+        if self.max_entries <= 0:
+            return
+
+        evicted = []
+        with self._lock:
+            if digest in self._entries and not replace:
+                # A concurrent upload of the same poster got here first; the other
+                # workspace is left for the TTL sweep since its report was already sent
+                self._entries.move_to_end(digest)
+                return
+            # The replaced entry's workspace is released to the TTL sweep likewise, clients
+            # may still be fetching the images of the report it was served with
+            self._entries.pop(digest, None)
+            self._entries[digest] = (copy.deepcopy(report), workspace)
+            while len(self._entries) > self.max_entries:
+                _, (_, old_workspace) = self._entries.popitem(last=False)
+                evicted.append(old_workspace)
+                self.evictions += 1
+
+        for old_workspace in evicted:
+            old_workspace.remove()
+
+    def workspace_ids(self):
+        """Job IDs of the workspaces that cached reports point to"""
+        with self._lock:
+            return {workspace.job_id for _, workspace in self._entries.values()}
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,135 @@
+import math
+from collections import defaultdict
+
+
+class GridIndex:
+    """Uniform grid over axis-aligned boxes (x1, y1, x2, y2).
+
+    Each item is registered in every cell its box touches, so a region query only
+    looks at the items of the cells the region covers. Results come back in
+    insertion order, which keeps OCR words in reading order.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.entries = []
+        self.bounds = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _cell_range(self, bbox):
+        x1, y1, x2, y2 = bbox
+        size = self.cell_size
+        return (int(x1 // size), int(y1 // size), int(x2 // size), int(y2 // size))
+
+    def insert(self, bbox, item):
+        index = len(self.entries)
+        self.entries.append((bbox, item))
+
+        cx1, cy1, cx2, cy2 = self._cell_range(bbox)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self.cells[(cx, cy)].append(index)
+
+        if self.bounds is None:
+            self.bounds = [cx1, cy1, cx2, cy2]
+        else:
+            self.bounds = [min(self.bounds[0], cx1), min(self.bounds[1], cy1),
+                           max(self.bounds[2], cx2), max(self.bounds[3], cy2)]
+
+    def _candidates(self, bbox):
+        cx1, cy1, cx2, cy2 = self._cell_range(bbox)
+        found = set()
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                found.update(self.cells.get((cx, cy), ()))
+        return sorted(found)
+
+    def intersecting(self, bbox):
+        """Items whose box overlaps bbox"""
+        x1, y1, x2, y2 = bbox
+        items = []
+        for index in self._candidates(bbox):
+            (ix1, iy1, ix2, iy2), item = self.entries[index]
+            if ix1 <= x2 and ix2 >= x1 and iy1 <= y2 and iy2 >= y1:
+                items.append(item)
+        return items
+
+    def contained(self, bbox):
+        """Items whose box lies completely inside bbox"""
+        x1, y1, x2, y2 = bbox
+        items = []
+        for index in self._candidates(bbox):
+            (ix1, iy1, ix2, iy2), item = self.entries[index]
+            if ix1 >= x1 and ix2 <= x2 and iy1 >= y1 and iy2 <= y2:
+                items.append(item)
+        return items
+
+    def centered_in(self, bbox):
+        """Items whose box center lies inside bbox (right and bottom edges excluded)"""
+        x1, y1, x2, y2 = bbox
+        items = []
+        for index in self._candidates(bbox):
+            (ix1, iy1, ix2, iy2), item = self.entries[index]
+            x, y = (ix1 + ix2) / 2, (iy1 + iy2) / 2
+            if x1 <= x < x2 and y1 <= y < y2:
+                items.append(item)
+        return items
+
+    def _ring_cells(self, pcx, pcy, ring):
+        """Cells at Chebyshev distance ring from (pcx, pcy), clipped to the occupied bounds"""
+        bx1, by1, bx2, by2 = self.bounds
+        if ring == 0:
+            yield (pcx, pcy)
+            return
+        x_start, x_end = max(pcx - ring, bx1), min(pcx + ring, bx2)
+        for cy in (pcy - ring, pcy + ring):
+            if by1 <= cy <= by2:
+                for cx in range(x_start, x_end + 1):
+                    yield (cx, cy)
+        y_start, y_end = max(pcy - ring + 1, by1), min(pcy + ring - 1, by2)
+        for cx in (pcx - ring, pcx + ring):
+            if bx1 <= cx <= bx2:
+                for cy in range(y_start, y_end + 1):
+                    yield (cx, cy)
+
+    def nearest(self, point, k=1, max_distance=math.inf):
+        """Up to k (distance, item) pairs closest to point, measured to the box centers.
+
+        Ties are broken by insertion order. The search walks outwards ring by ring
+        and stops once no unvisited cell can hold a closer center.
+        """
+        if not self.entries:
+            return []
+
+        px, py = point
+        size = self.cell_size
+        pcx, pcy = int(px // size), int(py // size)
+        bx1, by1, bx2, by2 = self.bounds
+        max_ring = max(abs(pcx - bx1), abs(pcx - bx2), abs(pcy - by1), abs(pcy - by2))
+
+        # Rings closer than this don't touch any occupied cell
+        first_ring = max(0, bx1 - pcx, pcx - bx2, by1 - pcy, pcy - by2)
+
+        seen = set()
+        best = []
+        for ring in range(first_ring, max_ring + 1):
+            for cell in self._ring_cells(pcx, pcy, ring):
+                for index in self.cells.get(cell, ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    (ix1, iy1, ix2, iy2), item = self.entries[index]
+                    distance = math.hypot((ix1 + ix2) / 2 - px, (iy1 + iy2) / 2 - py)
+                    if distance < max_distance:
+                        best.append((distance, index, item))
+
+            best.sort(key=lambda entry: (entry[0], entry[1]))
+            del best[k:]
+            # Every center not visited yet lies at least ring * cell_size away
+            if len(best) == k and best[-1][0] < ring * size:
+                break
+
+        return [(distance, item) for distance, _, item in best]
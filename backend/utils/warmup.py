@@ -0,0 +1,101 @@
+import time
+import logging
+import threading
+import cv2
+import numpy as np
+from utils.model_registry import model_registry
+from .config import WARMUP_ATTEMPTS, WARMUP_RETRY_SECONDS
+from .ocr import OcrIndex
+from .poster_layout import layout_predict_kwargs, classify_batch
+
+logger = logging.getLogger(__name__)
+
+
+def _sample_poster():
+    """A white poster with a heading, a line of text and a figure, enough to run every model once"""
+    image = np.full((1024, 768, 3), 255, dtype=np.uint8)
+    cv2.putText(image, "Warm-up Poster", (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.6, (0, 0, 0), 3)
+    cv2.putText(image, "Ada Lovelace, Alan Turing", (40, 140), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2)
+    cv2.rectangle(image, (80, 300), (680, 700), (200, 120, 40), -1)
+    return image
+
+
+class Warmup:
+    """Loads the models and runs one inference through each, Tesseract and spaCy included.
+
+    The first request after a deploy would otherwise pay for deserialization,
+    PyTorch kernel setup and the first Tesseract and spaCy calls. Every step
+    runs even if an earlier one fails, so the status lists all problems.
+    Failed steps are retried with exponential backoff, e.g. for a model file
+    still being synced; once the attempts run out the status stays "failed".
+    """
+
+    def __init__(self, registry=None, attempts=WARMUP_ATTEMPTS, retry_seconds=WARMUP_RETRY_SECONDS):
+        self.registry = registry or model_registry
+        self.attempts = attempts
+        self.retry_seconds = retry_seconds
+        self.attempt = 0
+        self.status = "pending"
+        self.steps = {}
+        self.errors = {}
+        self.seconds = None
+        self._done = threading.Event()
+
+    @property
+    def ready(self):
+        return self.status == "ready"
+
+    def start(self):
+        """Run the warm-up on a background thread.
+
+        Not a daemon: the interpreter waits for it on exit instead of tearing
+        down PyTorch and Tesseract under a running inference, which aborts the
+        process.
+        """
+        threading.Thread(target=self.run, name="warmup").start()
+        return self
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def run(self):
+        self.status = "running"
+        start = time.perf_counter()
+        poster = _sample_poster()
+        crop = poster[300:700, 80:680]
+        steps = {
+            "load_models": self.registry.load_all,
+            "base.pt": lambda: self.registry.get("base.pt").predict(poster, **layout_predict_kwargs()),
+            "figure_classifier.pt": lambda: classify_batch(self.registry.get("figure_classifier.pt"), [crop]),
+            "logo_classifier.pt": lambda: classify_batch(self.registry.get("logo_classifier.pt"), [crop]),
+            "en_core_web_sm": lambda: self.registry.get("en_core_web_sm").pipe(["Ada Lovelace, Alan Turing"]),
+            "tesseract": lambda: OcrIndex.from_image(poster),
+        }
+        pending = list(steps)
+        while pending and self.attempt < self.attempts:
+            if self.attempt:
+                delay = self.retry_seconds * 2 ** (self.attempt - 1)
+                logger.info(f"Retrying warm-up steps {', '.join(pending)} in {delay:.0f}s")
+                time.sleep(delay)
+            self.attempt += 1
+            for name in pending:
+                self.errors.pop(name, None)
+                self._step(name, steps[name])
+            pending = [name for name in pending if name in self.errors]
+        self.seconds = round(time.perf_counter() - start, 3)
+        self.status = "failed" if self.errors else "ready"
+        logger.info(f"Warm-up {self.status} in {self.seconds:.2f}s")
+        self._done.set()
+
+    def _step(self, name, fn):
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            logger.error(f"Warm-up step {name} failed: {e}")
+            self.errors[name] = str(e)
+        self.steps[name] = round(time.perf_counter() - start, 3)
+
+    def to_dict(self):
+        return {"status": self.status, "attempt": self.attempt, "seconds": self.seconds, "steps": self.steps,
+                "errors": self.errors}
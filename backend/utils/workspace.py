@@ -0,0 +1,56 @@
+import os
+import time
+import uuid
+import shutil
+from .config import WORKSPACES_DIR, WORKSPACE_TTL_SECONDS
+
+
+def image_url(path):
+    """get-image URL for a file stored under the utils directory"""
+    relative_path = os.path.relpath(path, "utils").replace(os.sep, "/")
+    return f"get-image/{relative_path}"
+
+
+class Workspace:
+    """Private directories for one evaluation, so concurrent requests never share files"""
+
+    def __init__(self, job_id=None, root=WORKSPACES_DIR):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.path = os.path.join(root, self.job_id)
+
+        self.directories = {
+            'input': os.path.join(self.path, "Input"),
+            'raw_components': os.path.join(self.path, "Memory", "Raw Components"),
+            'output': os.path.join(self.path, "Output"),
+            'logos': os.path.join(self.path, "Output", "Logos"),
+            'color_contrast': os.path.join(self.path, "Output", "Color_Contrast")
+        }
+
+        for directory in self.directories.values():
+            os.makedirs(directory, exist_ok=True)
+
+    def input_path(self, filename):
+        # Only keep the base name so uploads can't escape the workspace
+        filename = os.path.basename(filename or "") or "uploaded_poster.png"
+        return os.path.join(self.directories['input'], filename)
+
+    def remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def cleanup_expired_workspaces(ttl=WORKSPACE_TTL_SECONDS, root=WORKSPACES_DIR, keep=()):
+    """Delete workspaces older than ttl seconds, except the job IDs in keep"""
+    if not os.path.exists(root):
+        return
+
+    cutoff = time.time() - ttl
+    for job_id in os.listdir(root):
+        path = os.path.join(root, job_id)
+        if job_id in keep or not os.path.isdir(path):
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            # Removed by another worker in the meantime
+            pass